@@ -3,26 +3,65 @@ NASA EONET API Data Fetcher
 Retrieves complete natural events data directly from NASA's EONET API
 """
 
+import argparse
+import asyncio
+import aiohttp
 import requests
+import requests_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 import json
+import os
 from datetime import datetime, timedelta
-import time
+
+# Column types written by parse_events, fixed so per-chunk Parquet writes agree
+EVENT_SCHEMA = pa.schema([
+    ('ID', pa.string()),
+    ('Title', pa.string()),
+    ('Description', pa.string()),
+    ('Category_title', pa.string()),
+    ('Date', pa.string()),
+    ('Time', pa.string()),
+    ('Year', pa.int16()),
+    ('Longitude', pa.float32()),
+    ('Latitude', pa.float32())
+])
+
+# Statuses retried by both the requests session and the async chunk fetches
+RETRY_STATUSES = [429, 500, 502, 503, 504]
 
 class EONETDataFetcher:
     """Fetch natural events data from NASA EONET API"""
     
-    def __init__(self):
+    def __init__(self, use_cache=True):
         self.base_url = "https://eonet.gsfc.nasa.gov/api/v3"
         self.events_endpoint = f"{self.base_url}/events"
         self.categories_endpoint = f"{self.base_url}/categories"
         
+        # Persistent session so the TCP/TLS connection is reused across calls;
+        # identical (URL, params) requests are answered from a local SQLite cache
+        if use_cache:
+            self.session = requests_cache.CachedSession(
+                '.eonet_cache', backend='sqlite',
+                expire_after=timedelta(hours=6), allowable_methods=['GET']
+            )
+        else:
+            self.session = requests.Session()
+        retry = Retry(total=3, backoff_factor=1,
+                      status_forcelist=RETRY_STATUSES)
+        self.session.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=16,
+                                                   max_retries=retry))
+        
     def get_categories(self):
         """Fetch available event categories"""
         print("Fetching event categories from NASA EONET...")
         
         try:
-            response = requests.get(self.categories_endpoint)
+            response = self.session.get(self.categories_endpoint)
             response.raise_for_status()
             data = response.json()
             
@@ -81,7 +120,7 @@ class EONETDataFetcher:
             print(f"API URL: {self.events_endpoint}")
             print(f"Parameters: {params}\n")
             
-            response = requests.get(self.events_endpoint, params=params)
+            response = self.session.get(self.events_endpoint, params=params)
             response.raise_for_status()
             data = response.json()
             
@@ -98,137 +137,196 @@ class EONETDataFetcher:
         """Parse events into structured DataFrame"""
         print("Parsing event data...")
         
-        parsed_events = []
+        columns = ['ID', 'Title', 'Description', 'Category_title', 'Date',
+                   'Time', 'Year', 'Longitude', 'Latitude']
         
+        # Keep only point geometries and skip repeated (id, lon, lat) fixes
+        # here, so duplicate storm-track positions never become rows
+        seen = set()
+        deduped = []
         for event in events:
-            event_id = event.get('id')
-            title = event.get('title')
-            description = event.get('description', '')
-            
-            # Get categories
-            categories = event.get('categories', [])
-            category_title = categories[0]['title'] if categories else 'Unknown'
-            
-            # Get geometries (coordinates)
-            geometries = event.get('geometry', [])
-            
-            if geometries:
-                for geom in geometries:
-                    # Parse date
-                    date_str = geom.get('date')
-                    if date_str:
-                        try:
-                            dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                            date = dt.strftime('%Y-%m-%d')
-                            time = dt.strftime('%H:%M:%S')
-                            year = dt.year
-                        except:
-                            date = None
-                            time = None
-                            year = None
-                    else:
-                        date = None
-                        time = None
-                        year = None
-                    
-                    # Get coordinates
-                    coords = geom.get('coordinates', [])
-                    if coords and len(coords) >= 2:
-                        longitude = coords[0]
-                        latitude = coords[1]
-                    else:
-                        longitude = None
-                        latitude = None
-                    
-                    # Create event record
-                    parsed_events.append({
-                        'ID': event_id,
-                        'Title': title,
-                        'Description': description,
-                        'Category_title': category_title,
-                        'Date': date,
-                        'Time': time,
-                        'Year': year,
-                        'Longitude': longitude,
-                        'Latitude': latitude
-                    })
-            else:
-                # Event without geometry
-                parsed_events.append({
-                    'ID': event_id,
-                    'Title': title,
-                    'Description': description,
-                    'Category_title': category_title,
-                    'Date': None,
-                    'Time': None,
-                    'Year': None,
-                    'Longitude': None,
-                    'Latitude': None
-                })
-        
-        df = pd.DataFrame(parsed_events)
-        
-        # Remove duplicates and null coordinates
+            geometry = []
+            for geom in event.get('geometry') or ():
+                if geom.get('type') != 'Point':
+                    continue
+                # Points without usable coordinates are dropped (as the old dropna did)
+                coords = geom.get('coordinates') or ()
+                if len(coords) < 2 or coords[0] is None or coords[1] is None:
+                    continue
+                lon, lat = coords[:2]
+                key = (event['id'], round(lon, 4), round(lat, 4))
+                if key in seen:
+                    continue
+                seen.add(key)
+                geometry.append(geom)
+            if geometry:
+                deduped.append({**event, 'geometry': geometry})
+        events = deduped
+        if not events:
+            print("Parsed 0 valid event records\n")
+            return pd.DataFrame(columns=columns)
+        
+        # One row per geometry, carrying the parent event fields along
+        flat = pd.json_normalize(events, record_path='geometry',
+                                 meta=['id', 'title', 'description'],
+                                 errors='ignore')
+        
+        # Get categories (first listed category, repeated for each geometry),
+        # collecting title and geometry count in a single generator pass
+        per_event = pd.DataFrame.from_records(
+            ((event['categories'][0]['title'] if event.get('categories') else 'Unknown',
+              len(event['geometry'])) for event in events),
+            columns=['category_title', 'n_geometries'], nrows=len(events)
+        )
+        category_title = np.repeat(per_event['category_title'].to_numpy(),
+                                   per_event['n_geometries'].to_numpy())
+        
+        # Parse dates (invalid or missing dates become NaT)
+        dt = pd.to_datetime(flat['date'], utc=True, format='ISO8601', errors='coerce', cache=True)
+        stamp = dt.dt.strftime('%Y-%m-%d %H:%M:%S')
+        
+        # Get coordinates (only points are left at this stage)
+        lonlat = np.array([c[:2] for c in flat['coordinates']], dtype=float)
+        
+        df = pd.DataFrame({
+            'ID': flat['id'],
+            'Title': flat['title'],
+            'Description': flat['description'].fillna(''),  # '' as before, not NaN
+            'Category_title': category_title,
+            'Date': stamp.str[:10],
+            'Time': stamp.str[11:],
+            'Year': dt.dt.year.astype('Int16'),
+            'Longitude': lonlat[:, 0],
+            'Latitude': lonlat[:, 1]
+        }, columns=columns)
+        
+        # Remove null coordinates
         df = df.dropna(subset=['Longitude', 'Latitude'])
-        df = df.drop_duplicates(subset=['ID', 'Longitude', 'Latitude'])
+        
+        # Coordinates need no more than float32 precision
+        df = df.astype({'Longitude': 'float32', 'Latitude': 'float32'})
         
         print(f"Parsed {len(df)} valid event records\n")
         
         return df
     
-    def get_comprehensive_dataset(self, years_back=5):
+    async def _fetch_events_async(self, session, semaphore, params, retries=3, backoff_factor=1):
+        """Fetch one date-range chunk of events on an open aiohttp session,
+        retrying transient failures like the requests session's Retry policy"""
+        label = f"{params['start']} to {params['end']}"
+        for attempt in range(retries + 1):
+            async with semaphore:
+                try:
+                    async with session.get(self.events_endpoint, params=params) as response:
+                        if response.status not in RETRY_STATUSES or attempt == retries:
+                            response.raise_for_status()
+                            # Any content type; a body that is not JSON raises ValueError
+                            data = await response.json(content_type=None)
+                            if not isinstance(data, dict):
+                                raise ValueError("response is not a JSON object")
+                            return params, data.get('events', [])
+                        error = f"HTTP {response.status}"
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    error = str(e) or type(e).__name__
+                    if attempt == retries:
+                        print(f"Error fetching events for {label}: {error}")
+                        return params, None
+                except (aiohttp.ClientError, ValueError) as e:
+                    # Not transient: a 4xx, retries exhausted, or a malformed body
+                    print(f"Error fetching events for {label}: {e}")
+                    return params, None
+            # Back off outside the semaphore so the other chunks keep going
+            delay = backoff_factor * 2 ** attempt
+            print(f"Retrying {label} in {delay}s ({error})")
+            await asyncio.sleep(delay)
+    
+    async def _fetch_all_years(self, param_list, on_chunk):
+        """Fetch all date-range chunks concurrently (max 4 in flight),
+        handing each to on_chunk(params, events) as soon as it arrives"""
+        semaphore = asyncio.Semaphore(4)
+        async with aiohttp.ClientSession() as session:
+            tasks = [self._fetch_events_async(session, semaphore, params) for params in param_list]
+            for next_done in asyncio.as_completed(tasks):
+                params, events = await next_done
+                on_chunk(params, events)
+    
+    def get_comprehensive_dataset(self, years_back=5, filename='eonet_data.parquet'):
         """
         Fetch comprehensive dataset for multiple years
         
+        Each yearly chunk is parsed and appended to a Parquet file as it
+        arrives, so only one chunk of raw JSON is held in memory at a time.
+        
         Parameters:
         -----------
         years_back : int
             Number of years to fetch data for (default: 5)
+        filename : str
+            Parquet file the parsed chunks are streamed to
         """
         print("="*70)
         print(f"FETCHING COMPREHENSIVE DATASET ({years_back} years)")
         print("="*70 + "\n")
         
-        all_events = []
-        
         # Calculate date ranges
         end_date = datetime.now()
         start_date = end_date - timedelta(days=years_back*365)
         
         print(f"Date range: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}\n")
         
-        # Fetch in chunks (1 year at a time to avoid API limits)
+        # The API accepts arbitrary ranges, so try a single request first
+        # (an empty list is a valid answer; only None means the request failed)
+        events = self.fetch_events(days=years_back*365, status='all')
+        if events is not None:
+            return self.parse_events(events)
+        
+        print("Single request failed, falling back to yearly chunks...\n")
+        
+        # Chunk into 1-year ranges (to avoid API limits) and fetch them concurrently
+        param_list = []
         for year in range(years_back):
             chunk_end = end_date - timedelta(days=year*365)
             chunk_start = chunk_end - timedelta(days=365)
+            param_list.append({
+                'status': 'all',
+                'start': chunk_start.strftime('%Y-%m-%d'),
+                'end': chunk_end.strftime('%Y-%m-%d')
+            })
+        
+        print(f"Fetching {len(param_list)} yearly chunks concurrently...")
+        total_events = 0
+        
+        with pq.ParquetWriter(filename, EVENT_SCHEMA, compression='zstd') as writer:
+            def write_chunk(params, events):
+                nonlocal total_events
+                if not events:
+                    return
+                total_events += len(events)
+                print(f"  Retrieved {len(events)} events for {params['start'][:4]}")
+                df_chunk = self.parse_events(events)
+                if len(df_chunk) > 0:
+                    writer.write_table(pa.Table.from_pandas(df_chunk, schema=EVENT_SCHEMA,
+                                                            preserve_index=False))
             
-            print(f"Fetching year {chunk_start.year}...")
-            
-            events = self.fetch_events(
-                start_date=chunk_start.strftime('%Y-%m-%d'),
-                end_date=chunk_end.strftime('%Y-%m-%d'),
-                status='all'
-            )
-            
-            if events:
-                all_events.extend(events)
-                print(f"  Retrieved {len(events)} events for {chunk_start.year}")
-            
-            # Be nice to the API
-            time.sleep(1)
+            asyncio.run(self._fetch_all_years(param_list, write_chunk))
         
-        print(f"\nTotal events retrieved: {len(all_events)}")
+        print(f"\nTotal events retrieved: {total_events}")
         
-        # Parse all events
-        df = self.parse_events(all_events)
+        # Chunks share boundary dates, so drop events seen in more than one
+        df = pd.read_parquet(filename).astype({'Year': 'Int16'})
+        df = df.drop_duplicates(subset=['ID', 'Longitude', 'Latitude']).reset_index(drop=True)
         
         return df
     
-    def save_dataset(self, df, filename='eonet_data.csv'):
-        """Save dataset to CSV"""
-        df.to_csv(filename, index=False)
+    def save_dataset(self, df, filename='eonet_data.parquet', csv=False):
+        """Save dataset to Parquet (and optionally a CSV copy for inspection)"""
+        df.to_parquet(filename, compression='zstd', index=False)
         print(f"\n{'='*70}")
         print(f"Dataset saved to: {filename}")
+        if csv:
+            csv_filename = os.path.splitext(filename)[0] + '.csv'
+            df.to_csv(csv_filename, index=False)
+            print(f"CSV copy saved to: {csv_filename}")
         print(f"{'='*70}")
         
         # Print summary
@@ -249,11 +347,18 @@ class EONETDataFetcher:
 
 def main():
     """Main execution"""
+    parser = argparse.ArgumentParser(description="Fetch natural events data from NASA EONET")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="bypass the local API response cache")
+    parser.add_argument('--csv', action='store_true',
+                        help="also write eonet_data.csv for inspection")
+    args = parser.parse_args()
+    
     print("\n" + "="*70)
     print("NASA EONET DATA FETCHER")
     print("="*70 + "\n")
     
-    fetcher = EONETDataFetcher()
+    fetcher = EONETDataFetcher(use_cache=not args.no_cache)
     
     # Show available categories
     categories = fetcher.get_categories()
@@ -273,12 +378,12 @@ def main():
         events = fetcher.fetch_events(days=365)
         if events:
             df = fetcher.parse_events(events)
-            fetcher.save_dataset(df)
+            fetcher.save_dataset(df, csv=args.csv)
     
     elif choice == '2':
         # Last 5 years
         df = fetcher.get_comprehensive_dataset(years_back=5)
-        fetcher.save_dataset(df)
+        fetcher.save_dataset(df, csv=args.csv)
     
     elif choice == '3':
         # Custom date range
@@ -288,27 +393,27 @@ def main():
         events = fetcher.fetch_events(start_date=start, end_date=end)
         if events:
             df = fetcher.parse_events(events)
-            fetcher.save_dataset(df)
+            fetcher.save_dataset(df, csv=args.csv)
     
     elif choice == '4':
         # All available data (no date filter)
         events = fetcher.fetch_events(status='all')
         if events:
             df = fetcher.parse_events(events)
-            fetcher.save_dataset(df)
+            fetcher.save_dataset(df, csv=args.csv)
     
     else:
         print("Invalid choice. Fetching last 365 days by default...")
         events = fetcher.fetch_events(days=365)
         if events:
             df = fetcher.parse_events(events)
-            fetcher.save_dataset(df)
+            fetcher.save_dataset(df, csv=args.csv)
     
     print("\n" + "="*70)
     print("DATA FETCH COMPLETE!")
     print("="*70)
     print("\nNext steps:")
-    print("  1. Review eonet_data.csv")
+    print("  1. Review eonet_data.parquet")
     print("  2. Run: python 01_data_loading.py")
     print("  3. Continue with analysis pipeline")
     print("\n")
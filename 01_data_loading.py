@@ -4,6 +4,8 @@ Perfect match for CSV: ID,Title,Description,Category_title,Date,Time,Year,Longit
 """
 
 import pandas as pd
+import numpy as np
+import os
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -14,7 +16,10 @@ def load_and_clean_data(filepath):
     print("="*70)
     
     # Load data
-    df = pd.read_csv(filepath)
+    if filepath.endswith('.parquet'):
+        df = pd.read_parquet(filepath)
+    else:
+        df = pd.read_csv(filepath)
     
     print(f"\n✓ Loaded {len(df)} events")
     print(f"\nColumns: {', '.join(df.columns.tolist())}")
@@ -24,7 +29,11 @@ def load_and_clean_data(filepath):
     
     # Create datetime from Date and Time
     print("\nCreating datetime features...")
-    df['datetime'] = pd.to_datetime(df['date'] + ' ' + df['time'].fillna('00:00:00'))
+    if 'datetime' in df.columns:
+        df['datetime'] = pd.to_datetime(df['datetime'], cache=True)
+    else:
+        df['datetime'] = (pd.to_datetime(df['date'], format='%Y-%m-%d', cache=True) +
+                          pd.to_timedelta(df['time'].fillna('00:00:00')))
     
     # Extract temporal features
     df['month'] = df['datetime'].dt.month
@@ -35,24 +44,17 @@ def load_and_clean_data(filepath):
     # Handle descriptions
     df['description'] = df['description'].fillna('No description')
     
-    # Simplified categories
-    def simplify_category(cat):
-        if pd.isna(cat):
-            return 'Other'
-        cat = str(cat).lower()
-        if 'wildfire' in cat:
-            return 'Wildfire'
-        elif 'storm' in cat:
-            return 'Storm'
-        elif 'flood' in cat:
-            return 'Flood'
-        elif 'volcano' in cat:
-            return 'Volcano'
-        elif 'ice' in cat:
-            return 'Ice'
-        return 'Other'
+    # Simplified categories (first matching keyword wins)
+    lower = df['category_title'].astype(str).str.lower()
+    keywords = ['wildfire', 'storm', 'flood', 'volcano', 'ice']
+    conds = [lower.str.contains(k, regex=False).to_numpy() for k in keywords]
+    df['category_simple'] = pd.Categorical(
+        np.select(conds, ['Wildfire', 'Storm', 'Flood', 'Volcano', 'Ice'], default='Other')
+    )
     
-    df['category_simple'] = df['category_title'].apply(simplify_category)
+    # Low-cardinality string columns as categoricals (int codes for groupby/value_counts)
+    for col in ['category_title', 'month_name', 'day_of_week']:
+        df[col] = df[col].astype('category')
     
     print("✓ Features created")
     print(f"\nDate range: {df['datetime'].min()} to {df['datetime'].max()}")
@@ -67,18 +69,24 @@ if __name__ == "__main__":
     print("\nNASA EONET - DATA LOADING\n")
     
     try:
-        df = load_and_clean_data('eonet_data.csv')
+        # Prefer the Parquet output of 00_fetch_data_from_api.py, fall back to CSV
+        input_path = 'eonet_data.parquet' if os.path.exists('eonet_data.parquet') else 'eonet_data.csv'
+        df = load_and_clean_data(input_path)
+        # CSV copy is still read by the dashboard scripts; write it first so
+        # the Parquet file is never older than the CSV
         df.to_csv('eonet_cleaned.csv', index=False)
+        df.to_parquet('eonet_cleaned.parquet', engine='pyarrow', compression='zstd',
+                      row_group_size=100_000, index=False)
         
         print("\n" + "="*70)
-        print("✓ SUCCESS! Cleaned data saved to: eonet_cleaned.csv")
+        print("✓ SUCCESS! Cleaned data saved to: eonet_cleaned.parquet (+ eonet_cleaned.csv)")
         print("="*70)
         print("\nSample data:")
         print(df[['title', 'category_title', 'latitude', 'longitude', 'date']].head())
         print("\nNext: Run python 02_exploratory_analysis.py")
         
     except FileNotFoundError:
-        print("\nERROR: eonet_data.csv not found!")
-        print("Make sure the CSV file is in the current directory.")
+        print("\nERROR: eonet_data.parquet / eonet_data.csv not found!")
+        print("Make sure the data file is in the current directory.")
     except Exception as e:
         print(f"\nERROR: {e}")
\ No newline at end of file
@@ -3,20 +3,53 @@ NASA EONET Natural Events - Exploratory Data Analysis
 """
 
 import pandas as pd
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
 import warnings
 warnings.filterwarnings('ignore')
 
-def create_temporal_analysis(df):
+MONTH_ORDER = ['January', 'February', 'March', 'April', 'May', 'June',
+               'July', 'August', 'September', 'October', 'November', 'December']
+DAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# 150 is plenty for iterating; set EONET_DPI=300 for publication output
+DPI = int(os.environ.get('EONET_DPI', 150))
+
+def _precompute(df):
+    """Compute every aggregate the plots need in one place"""
+    cat_counts = df['category_title'].value_counts()
+    top_cats = cat_counts.head(5).index
+    lat = df['latitude'].to_numpy()
+    lon = df['longitude'].to_numpy()
+    
+    return {
+        'monthly': df.groupby(df['datetime'].dt.to_period('M')).size(),
+        'yearly': df['year'].value_counts().sort_index(),
+        'by_month_name': df['month_name'].value_counts().reindex(MONTH_ORDER),
+        'by_dow': df['day_of_week'].value_counts().reindex(DAY_ORDER),
+        'cat_counts': cat_counts,
+        'top_cats_year': pd.crosstab(df['year'], df['category_title'])[top_cats],
+        # Fixed ranges skip the min/max scan and keep bins comparable across runs
+        'lat_hist': np.histogram(lat, bins=50, range=(-90, 90)),
+        'lon_hist': np.histogram(lon, bins=50, range=(-180, 180)),
+        'lat_mean': float(lat.mean()),
+        'lon_mean': float(lon.mean())
+    }
+
+def create_temporal_analysis(agg, fig):
     """Create temporal visualizations"""
     print("Creating temporal analysis...")
     
-    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+    fig.clear()
+    fig.set_size_inches(16, 12)
+    axes = fig.subplots(2, 2)
     
     # Events over time (monthly)
-    monthly = df.groupby(df['datetime'].dt.to_period('M')).size()
+    monthly = agg['monthly']
     axes[0, 0].plot(monthly.index.astype(str), monthly.values, color='steelblue', linewidth=2)
     axes[0, 0].set_title('Events Over Time (Monthly)', fontsize=14, fontweight='bold')
     axes[0, 0].set_xlabel('Date')
@@ -25,7 +58,7 @@ def create_temporal_analysis(df):
     axes[0, 0].grid(True, alpha=0.3)
     
     # Events by year
-    yearly = df['year'].value_counts().sort_index()
+    yearly = agg['yearly']
     axes[0, 1].bar(yearly.index, yearly.values, color='coral', edgecolor='black')
     axes[0, 1].set_title('Events by Year', fontsize=14, fontweight='bold')
     axes[0, 1].set_xlabel('Year')
@@ -33,37 +66,35 @@ def create_temporal_analysis(df):
     axes[0, 1].tick_params(axis='x', rotation=45)
     
     # Events by month
-    month_order = ['January', 'February', 'March', 'April', 'May', 'June',
-                   'July', 'August', 'September', 'October', 'November', 'December']
-    monthly_counts = df['month_name'].value_counts().reindex(month_order)
+    monthly_counts = agg['by_month_name']
     axes[1, 0].bar(range(12), monthly_counts.values, color='seagreen', edgecolor='black')
     axes[1, 0].set_xticks(range(12))
-    axes[1, 0].set_xticklabels([m[:3] for m in month_order], rotation=45)
+    axes[1, 0].set_xticklabels([m[:3] for m in MONTH_ORDER], rotation=45)
     axes[1, 0].set_title('Events by Month (All Years)', fontsize=14, fontweight='bold')
     axes[1, 0].set_ylabel('Number of Events')
     
     # Events by day of week
-    day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    day_counts = df['day_of_week'].value_counts().reindex(day_order)
+    day_counts = agg['by_dow']
     axes[1, 1].bar(range(7), day_counts.values, color='mediumpurple', edgecolor='black')
     axes[1, 1].set_xticks(range(7))
-    axes[1, 1].set_xticklabels([d[:3] for d in day_order], rotation=45)
+    axes[1, 1].set_xticklabels([d[:3] for d in DAY_ORDER], rotation=45)
     axes[1, 1].set_title('Events by Day of Week', fontsize=14, fontweight='bold')
     axes[1, 1].set_ylabel('Number of Events')
     
-    plt.tight_layout()
-    plt.savefig('analysis_outputs/temporal_analysis.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.savefig('analysis_outputs/temporal_analysis.png', dpi=DPI)
+    fig.clear()
     print("  ✓ Saved: temporal_analysis.png")
 
-def create_category_analysis(df):
+def create_category_analysis(agg, fig):
     """Create category visualizations"""
     print("Creating category analysis...")
     
-    fig, axes = plt.subplots(1, 2, figsize=(16, 6))
+    fig.clear()
+    fig.set_size_inches(16, 6)
+    axes = fig.subplots(1, 2)
     
     # Category distribution
-    cat_counts = df['category_title'].value_counts().head(10)
+    cat_counts = agg['cat_counts'].head(10)
     axes[0].barh(range(len(cat_counts)), cat_counts.values, color='teal', edgecolor='black')
     axes[0].set_yticks(range(len(cat_counts)))
     axes[0].set_yticklabels(cat_counts.index, fontsize=10)
@@ -72,11 +103,7 @@ def create_category_analysis(df):
     axes[0].invert_yaxis()
     
     # Category trends over time
-    top_cats = df['category_title'].value_counts().head(5).index
-    for cat in top_cats:
-        cat_data = df[df['category_title'] == cat]
-        yearly = cat_data.groupby('year').size()
-        axes[1].plot(yearly.index, yearly.values, marker='o', label=cat, linewidth=2)
+    agg['top_cats_year'].plot(ax=axes[1], marker='o', linewidth=2)
     
     axes[1].set_title('Top 5 Categories Over Time', fontsize=14, fontweight='bold')
     axes[1].set_xlabel('Year')
@@ -84,36 +111,40 @@ def create_category_analysis(df):
     axes[1].legend(fontsize=9)
     axes[1].grid(True, alpha=0.3)
     
-    plt.tight_layout()
-    plt.savefig('analysis_outputs/category_analysis.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.savefig('analysis_outputs/category_analysis.png', dpi=DPI)
+    fig.clear()
     print("  ✓ Saved: category_analysis.png")
 
-def create_geographic_analysis(df):
+def create_geographic_analysis(agg, fig):
     """Create geographic visualizations"""
     print("Creating geographic analysis...")
     
-    fig, axes = plt.subplots(1, 2, figsize=(16, 6))
+    fig.clear()
+    fig.set_size_inches(16, 6)
+    axes = fig.subplots(1, 2)
     
     # Latitude distribution
-    axes[0].hist(df['latitude'], bins=50, color='skyblue', edgecolor='black')
-    axes[0].axvline(df['latitude'].mean(), color='red', linestyle='--', linewidth=2, label='Mean')
+    counts, edges = agg['lat_hist']
+    axes[0].bar(edges[:-1], counts, width=np.diff(edges), align='edge',
+                color='skyblue', edgecolor='black')
+    axes[0].axvline(agg['lat_mean'], color='red', linestyle='--', linewidth=2, label='Mean')
     axes[0].set_title('Latitude Distribution', fontsize=14, fontweight='bold')
     axes[0].set_xlabel('Latitude')
     axes[0].set_ylabel('Frequency')
     axes[0].legend()
     
     # Longitude distribution
-    axes[1].hist(df['longitude'], bins=50, color='lightcoral', edgecolor='black')
-    axes[1].axvline(df['longitude'].mean(), color='red', linestyle='--', linewidth=2, label='Mean')
+    counts, edges = agg['lon_hist']
+    axes[1].bar(edges[:-1], counts, width=np.diff(edges), align='edge',
+                color='lightcoral', edgecolor='black')
+    axes[1].axvline(agg['lon_mean'], color='red', linestyle='--', linewidth=2, label='Mean')
     axes[1].set_title('Longitude Distribution', fontsize=14, fontweight='bold')
     axes[1].set_xlabel('Longitude')
     axes[1].set_ylabel('Frequency')
     axes[1].legend()
     
-    plt.tight_layout()
-    plt.savefig('analysis_outputs/geographic_distribution.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.savefig('analysis_outputs/geographic_distribution.png', dpi=DPI)
+    fig.clear()
     print("  ✓ Saved: geographic_distribution.png")
 
 if __name__ == "__main__":
@@ -121,9 +152,10 @@ if __name__ == "__main__":
     print("="*70)
     
     try:
-        # Load cleaned data
-        df = pd.read_csv('eonet_cleaned.csv')
-        df['datetime'] = pd.to_datetime(df['datetime'])
+        # Load cleaned data (only the columns the plots use)
+        df = pd.read_parquet('eonet_cleaned.parquet',
+                             columns=['datetime', 'year', 'month_name', 'day_of_week',
+                                      'category_title', 'latitude', 'longitude'])
         
         print(f"Loaded {len(df)} events\n")
         
@@ -131,9 +163,12 @@ if __name__ == "__main__":
         os.makedirs('analysis_outputs', exist_ok=True)
         
         # Create all visualizations
-        create_temporal_analysis(df)
-        create_category_analysis(df)
-        create_geographic_analysis(df)
+        agg = _precompute(df)
+        fig = plt.figure(figsize=(16, 12), layout='constrained')
+        create_temporal_analysis(agg, fig)
+        create_category_analysis(agg, fig)
+        create_geographic_analysis(agg, fig)
+        plt.close(fig)
         
         # Print statistics
         print("\n" + "="*70)
@@ -152,7 +187,7 @@ if __name__ == "__main__":
         print("\nNext: Run python 03_geospatial_visualization.py")
         
     except FileNotFoundError:
-        print("\nERROR: eonet_cleaned.csv not found!")
+        print("\nERROR: eonet_cleaned.parquet not found!")
         print("Run 01_data_loading.py first.")
     except Exception as e:
         print(f"\nERROR: {e}")
\ No newline at end of file
@@ -13,38 +13,135 @@ Key Principles:
 
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from plotly.subplots import make_subplots
 import folium
 from folium.plugins import HeatMap, MarkerCluster
 import seaborn as sns
 from datetime import datetime
-from scipy.stats import gaussian_kde
 from sklearn.cluster import DBSCAN
 from sklearn.preprocessing import StandardScaler
+import argparse
 import os
+import sys
+import hashlib
+import gc
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import eonet_common
+from eonet_common import parquet_is_fresh, worker_count, pool_context, binned_kde, cell_ids
 import warnings
 warnings.filterwarnings('ignore')
 
 plt.style.use('seaborn-v0_8-whitegrid')
+plt.rcParams['agg.path.chunksize'] = 10000
 sns.set_palette("Set2")
+pio.json.config.default_engine = 'orjson'
+
+# Columns PolicyVisualizationSuite reads from the cleaned data
+EVENT_COLUMNS = ['title', 'category_title', 'latitude', 'longitude', 'datetime']
+
+# Run sentinels and the prepared-frame cache (kept out of the output folder)
+CACHE_DIR = '.viz_cache'
+
+# Files written by create_all_visualizations
+OUTPUT_FILES = ['01_executive_dashboard.html', '02_risk_hotspot_map.html',
+                '03_temporal_risk_analysis.html', '04_3d_intelligence_globe.html',
+                '05_regional_impact_analysis.html', '06_trend_forecasting.html',
+                '07_seasonal_risk_calendar.html', '08_policy_report.png']
+
+# Policy report resolution; set EONET_DPI=300 for print output
+DPI = int(os.environ.get('EONET_DPI', 150))
+
+# Land/coast styling shared by the map charts
+GEO_STYLE = dict(showland=True, landcolor='rgb(243, 243, 243)', coastlinecolor='rgb(204, 204, 204)')
+
+# Season by month number (index 0 unused)
+SEASONS = ['Winter', 'Spring', 'Summer', 'Fall']
+SEASON_LUT = np.array(['', 'Winter', 'Winter', 'Spring', 'Spring', 'Spring', 'Summer',
+                       'Summer', 'Summer', 'Fall', 'Fall', 'Fall', 'Winter'])
+
+# Suite shared with chart pool workers (sent once per worker by the initializer)
+_SUITE = None
+
+# scipy.fft threads: the script's worker budget when charts run sequentially,
+# one inside pool workers so the processes do not oversubscribe the cores
+_FFT_WORKERS = worker_count()
+
+
+def _init_worker(suite):
+    """Keep the suite for every chart this worker builds"""
+    global _SUITE, _FFT_WORKERS
+    _SUITE = suite
+    _FFT_WORKERS = 1
+
+
+def _prune_cache(keep, prefix, suffix):
+    """Delete every CACHE_DIR entry named prefix*suffix except `keep`"""
+    for entry in os.scandir(CACHE_DIR):
+        if (entry.name.startswith(prefix) and entry.name.endswith(suffix)
+                and entry.path != keep):
+            os.remove(entry.path)
+
+
+def _build_chart(name):
+    """Run one chart builder on the worker's suite"""
+    getattr(_SUITE, name)()
+    gc.collect()
+
+
+def _top_counts(values, k):
+    """Top-k value counts in descending order, without sorting every distinct value"""
+    codes, uniques = pd.factorize(values)
+    counts = np.bincount(codes[codes >= 0])
+    k = min(k, len(counts))
+    if k == 0:
+        return pd.Series(dtype='int64')
+    top = np.argpartition(-counts, k - 1)[:k]
+    top = top[np.argsort(-counts[top], kind='stable')]
+    return pd.Series(counts[top], index=np.asarray(uniques)[top])
 
 
 class PolicyVisualizationSuite:
     """Policy-focused geospatial visualization suite"""
     
-    def __init__(self, df):
-        self.df = df
+    # Chart builders by report section; each only reads self.df and the cached aggregates
+    SECTIONS = [
+        ("Section 1: Executive Summary Dashboard", ['create_executive_dashboard']),
+        ("Section 2: Risk Assessment Maps", ['create_risk_hotspot_map', 'create_temporal_risk_analysis']),
+        ("Section 3: Geographic Intelligence", ['create_3d_globe_intelligence', 'create_regional_impact_analysis']),
+        ("Section 4: Predictive Insights", ['create_trend_forecasting', 'create_seasonal_risk_calendar']),
+        ("Section 5: Policy Recommendation Report", ['create_policy_report'])
+    ]
+    
+    def __init__(self, df, cache_key=None):
         self.output_dir = 'policy_visualizations'
         os.makedirs(self.output_dir, exist_ok=True)
+        self.df = df = self._load_or_prepare(df, cache_key)
         
         # Analyze actual date range
         self.start_date = df['datetime'].min()
         self.end_date = df['datetime'].max()
         self.date_range_years = (self.end_date - self.start_date).days / 365.25
         
+        # Aggregates shared by several charts, computed once
+        self._yearly = df.groupby('year').size()
+        self._monthly = df['month'].value_counts().sort_index()
+        self._cat_counts = _top_counts(df['category_title'], 5)
+        self._weekly = df.resample('W', on='datetime').size()
+        self._region_counts = df['region'].value_counts()
+        
+        # Fixed event sample reused by the point-level charts
+        sample_idx = np.random.default_rng(42).choice(len(df), size=min(2000, len(df)), replace=False)
+        self._sample_2k = df.iloc[np.sort(sample_idx)]
+        
         print("="*80)
         print("POLICY-FOCUSED VISUALIZATION SUITE")
         print("="*80)
@@ -54,33 +151,88 @@ class PolicyVisualizationSuite:
         print(f"Categories: {df['category_title'].nunique()}")
         print("="*80 + "\n")
     
-    def create_all_visualizations(self):
+    def _load_or_prepare(self, df, cache_key=None):
+        """Return the typed, augmented frame, reusing the copy prepared by an earlier run"""
+        # Keyed on the input file's stats (see _input_key), so any change to the
+        # data - not just coordinates and times - prepares the frame afresh
+        cache = os.path.join(CACHE_DIR, f'df_{cache_key}.parquet') if cache_key else None
+        if cache and os.path.exists(cache):
+            print(f"Using prepared data cache: {cache}")
+            return pd.read_parquet(cache)
+        
+        # Events without a timestamp cannot be placed on any time axis
+        missing = df['datetime'].isna()
+        if missing.any():
+            print(f"Dropping {missing.sum():,} events without a date")
+            df = df[~missing].reset_index(drop=True)
+        
+        # Calendar fields used by several charts, derived once
+        dt = df['datetime'].dt
+        df['day_of_month'] = dt.day.astype('int8')
+        df['year'] = dt.year.astype('int16')
+        df['month'] = dt.month.astype('int8')
+        df['season'] = pd.Categorical(SEASON_LUT[df['month'].to_numpy()],
+                                      categories=SEASONS, ordered=True)
+        
+        # float32 coordinates are ample for plotting; categories become integer codes
+        df['latitude'] = df['latitude'].astype('float32')
+        df['longitude'] = df['longitude'].astype('float32')
+        df['category_title'] = df['category_title'].astype('category')
+        
+        self._assign_regions(df)
+        
+        if cache:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            df.to_parquet(cache, compression='snappy')
+            # Only the latest prepared frame is kept
+            _prune_cache(cache, 'df_', '.parquet')
+        return df
+    
+    def _assign_regions(self, df):
+        """Label each event with a broad world region"""
+        # Define meaningful regions (longitude bands split by latitude)
+        lat = df['latitude'].to_numpy()
+        lon = df['longitude'].to_numpy()
+        americas = (lon > -170) & (lon < -50)
+        eur_afr = (lon > -20) & (lon < 60)
+        asia_oce = (lon > 60) & (lon < 150)
+        
+        regions = np.select(
+            [americas & (lat > 15), americas,
+             eur_afr & (lat > 35), eur_afr,
+             asia_oce & (lat > 0), asia_oce],
+            ['North America', 'South America', 'Europe', 'Africa', 'Asia', 'Oceania'],
+            default='Other'
+        )
+        df['region'] = pd.Categorical(regions)
+    
+    def _base_layout(self, **overrides):
+        """Layout settings shared by the Plotly charts, with per-chart overrides"""
+        layout = dict(title_font_size=20, height=700, showlegend=False)
+        layout.update(overrides)
+        return layout
+    
+    def create_all_visualizations(self, workers=None):
         """Generate all policy-focused visualizations"""
-        
         print("GENERATING POLICY VISUALIZATIONS\n")
         
-        # Section 1: Executive Summary
-        print("Section 1: Executive Summary Dashboard")
-        self.create_executive_dashboard()
-        
-        # Section 2: Risk Assessment
-        print("\nSection 2: Risk Assessment Maps")
-        self.create_risk_hotspot_map()
-        self.create_temporal_risk_analysis()
-        
-        # Section 3: Geographic Intelligence
-        print("\nSection 3: Geographic Intelligence")
-        self.create_3d_globe_intelligence()
-        self.create_regional_impact_analysis()
-        
-        # Section 4: Predictive Insights
-        print("\nSection 4: Predictive Insights")
-        self.create_trend_forecasting()
-        self.create_seasonal_risk_calendar()
-        
-        # Section 5: Policy Recommendations
-        print("\nSection 5: Policy Recommendation Report")
-        self.create_policy_report()
+        workers = workers or worker_count()
+        if workers > 1:
+            # Charts are independent, so build them in parallel; each worker
+            # receives the suite (and its DataFrame) once, via the initializer
+            names = [name for _, section in self.SECTIONS for name in section]
+            print(f"Building {len(names)} charts on {workers} worker processes")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=pool_context(),
+                                     initializer=_init_worker, initargs=(self,)) as pool:
+                list(pool.map(_build_chart, names))
+        else:
+            for i, (title, names) in enumerate(self.SECTIONS):
+                print(("\n" if i else "") + title)
+                for name in names:
+                    getattr(self, name)()
+                    # Figures hold reference cycles; free their trace arrays
+                    # before the next chart allocates its own
+                    gc.collect()
         
         print("\n" + "="*80)
         print("VISUALIZATION SUITE COMPLETE")
@@ -112,7 +264,7 @@ class PolicyVisualizationSuite:
         )
         
         # 1. Clean pie chart with readable labels
-        cat_counts = self.df['category_title'].value_counts().head(5)
+        cat_counts = self._cat_counts.head(5)
         colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A', '#98D8C8']
         
         fig.add_trace(
@@ -131,7 +283,7 @@ class PolicyVisualizationSuite:
         # 2. Temporal trend - adaptive to date range
         if self.date_range_years > 3:
             # Yearly trend for longer periods
-            yearly = self.df.groupby('year').size()
+            yearly = self._yearly
             x_data = yearly.index
             y_data = yearly.values
             x_title = 'Year'
@@ -156,29 +308,32 @@ class PolicyVisualizationSuite:
             row=1, col=2
         )
         
-        # 3. Geographic coverage - sampled for clarity
-        sample_size = min(1000, len(self.df))
-        df_sample = self.df.sample(sample_size, random_state=42)
+        # 3. Geographic coverage - events binned to 1° cells so every event
+        # counts toward the density while the marker count stays bounded
+        lat = self.df['latitude'].to_numpy()
+        lon = self.df['longitude'].to_numpy()
+        cell, cell_counts = np.unique(cell_ids(lon, lat), return_counts=True)
         
         fig.add_trace(
             go.Scattergeo(
-                lon=df_sample['longitude'],
-                lat=df_sample['latitude'],
+                lon=cell % 360 - 180 + 0.5,
+                lat=cell // 360 - 90 + 0.5,
+                customdata=cell_counts,
                 mode='markers',
                 marker=dict(
-                    size=4,
+                    size=3 + 9 * np.sqrt(cell_counts / cell_counts.max()),
                     color='#FF6B6B',
                     opacity=0.6,
                     line=dict(width=0)
                 ),
                 name='Events',
-                hovertemplate='Lat: %{lat:.2f}<br>Lon: %{lon:.2f}<extra></extra>'
+                hovertemplate='Lat: %{lat:.1f}<br>Lon: %{lon:.1f}<br>Events: %{customdata}<extra></extra>'
             ),
             row=1, col=3
         )
         
         # 4. Monthly risk pattern - all months
-        month_counts = self.df['month'].value_counts().sort_index()
+        month_counts = self._monthly
         month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
                       'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
         
@@ -192,18 +347,19 @@ class PolicyVisualizationSuite:
             row=2, col=1
         )
         
-        # 5. Top affected regions (by coordinate clustering)
-        self.df['lat_region'] = pd.cut(self.df['latitude'], bins=10, labels=False)
-        self.df['lon_region'] = pd.cut(self.df['longitude'], bins=10, labels=False)
-        self.df['region_id'] = self.df['lat_region'].astype(str) + '_' + self.df['lon_region'].astype(str)
+        # 5. Top affected regions (by coordinate clustering on a 10x10 grid)
+        lat_bin = np.digitize(lat, np.linspace(lat.min(), lat.max(), 11)[1:-1])
+        lon_bin = np.digitize(lon, np.linspace(lon.min(), lon.max(), 11)[1:-1])
+        region_counts = np.bincount(lat_bin * 10 + lon_bin, minlength=100)
         
-        top_regions = self.df['region_id'].value_counts().head(5)
+        top_regions = np.sort(region_counts[np.argpartition(-region_counts, 5)[:5]])[::-1]
+        top_regions = top_regions[top_regions > 0]
         region_labels = [f"Region {i+1}" for i in range(len(top_regions))]
         
         fig.add_trace(
             go.Bar(
                 x=region_labels,
-                y=top_regions.values,
+                y=top_regions,
                 marker=dict(color='#45B7D1'),
                 name='Events per Region'
             ),
@@ -228,9 +384,7 @@ class PolicyVisualizationSuite:
         
         # Update layout
         fig.update_geos(
-            showland=True,
-            landcolor='rgb(243, 243, 243)',
-            coastlinecolor='rgb(204, 204, 204)',
+            **GEO_STYLE,
             projection_type='natural earth',
             showframe=False
         )
@@ -242,14 +396,13 @@ class PolicyVisualizationSuite:
         fig.update_xaxes(title_text='Region', row=2, col=2)
         fig.update_yaxes(title_text='Events', row=2, col=2)
         
-        fig.update_layout(
+        fig.update_layout(**self._base_layout(
             title_text=f"<b>Executive Dashboard: Natural Events {self.start_date.year}-{self.end_date.year}</b>",
             title_font_size=22,
-            showlegend=False,
             height=900
-        )
+        ))
         
-        fig.write_html(f'{self.output_dir}/01_executive_dashboard.html')
+        fig.write_html(f'{self.output_dir}/01_executive_dashboard.html', include_plotlyjs='cdn', validate=False)
         print("    ✓ Saved: 01_executive_dashboard.html")
     
     # ========== RISK ASSESSMENT ==========
@@ -258,10 +411,6 @@ class PolicyVisualizationSuite:
         """Advanced hotspot analysis for risk assessment"""
         print("  Creating Risk Hotspot Map...")
         
-        # Create KDE for risk zones
-        xy = np.vstack([self.df['longitude'], self.df['latitude']])
-        kde = gaussian_kde(xy, bw_method='scott')
-        
         # Create grid
         lon_range = self.df['longitude'].max() - self.df['longitude'].min()
         lat_range = self.df['latitude'].max() - self.df['latitude'].min()
@@ -270,11 +419,10 @@ class PolicyVisualizationSuite:
                               self.df['longitude'].max() + lon_range*0.1, 100)
         lat_grid = np.linspace(self.df['latitude'].min() - lat_range*0.1, 
                               self.df['latitude'].max() + lat_range*0.1, 100)
-        lon_mesh, lat_mesh = np.meshgrid(lon_grid, lat_grid)
         
-        # Evaluate KDE
-        grid_coords = np.vstack([lon_mesh.ravel(), lat_mesh.ravel()])
-        z = kde(grid_coords).reshape(lon_mesh.shape)
+        # Evaluate KDE for risk zones
+        z = binned_kde(self.df['longitude'].to_numpy(), self.df['latitude'].to_numpy(),
+                       lon_grid, lat_grid, workers=_FFT_WORKERS)
         
         # Create risk zones
         fig = go.Figure()
@@ -308,10 +456,11 @@ class PolicyVisualizationSuite:
             )
         ))
         
-        # Add scatter overlay
+        # Add scatter overlay (the fixed sample once the full set would just be haze)
+        overlay = self.df if len(self.df) < 5000 else self._sample_2k
         fig.add_trace(go.Scatter(
-            x=self.df['longitude'],
-            y=self.df['latitude'],
+            x=overlay['longitude'],
+            y=overlay['latitude'],
             mode='markers',
             marker=dict(
                 size=3,
@@ -323,17 +472,14 @@ class PolicyVisualizationSuite:
             hovertemplate='<b>Event</b><br>Lat: %{y:.2f}<br>Lon: %{x:.2f}<extra></extra>'
         ))
         
-        fig.update_layout(
-            title=f'<b>Risk Hotspot Analysis ({self.start_date.year}-{self.end_date.year})</b><br>' + 
-                  '<sub>Kernel Density Estimation showing high-risk zones</sub>',
-            title_font_size=20,
+        fig.update_layout(**self._base_layout(
+            title_text=f'<b>Risk Hotspot Analysis ({self.start_date.year}-{self.end_date.year})</b><br>' + 
+                       '<sub>Kernel Density Estimation showing high-risk zones</sub>',
             xaxis_title='Longitude',
-            yaxis_title='Latitude',
-            height=700,
-            showlegend=False
-        )
+            yaxis_title='Latitude'
+        ))
         
-        fig.write_html(f'{self.output_dir}/02_risk_hotspot_map.html')
+        fig.write_html(f'{self.output_dir}/02_risk_hotspot_map.html', include_plotlyjs='cdn', validate=False)
         print("    ✓ Saved: 02_risk_hotspot_map.html")
     
     def create_temporal_risk_analysis(self):
@@ -350,13 +496,13 @@ class PolicyVisualizationSuite:
             row_heights=[0.5, 0.5]
         )
         
-        # Cumulative trend
-        daily = self.df.groupby(self.df['datetime'].dt.date).size().sort_index()
-        cumulative = daily.cumsum()
+        # Cumulative trend (weekly buckets; daily points add nothing at screen width)
+        weekly = self._weekly
+        cumulative = weekly.cumsum()
         
         fig.add_trace(
             go.Scatter(
-                x=daily.index,
+                x=weekly.index,
                 y=cumulative.values,
                 mode='lines',
                 fill='tozeroy',
@@ -368,23 +514,19 @@ class PolicyVisualizationSuite:
         )
         
         # Seasonal heatmap
-        self.df['season'] = self.df['month'].map({
-            12: 'Winter', 1: 'Winter', 2: 'Winter',
-            3: 'Spring', 4: 'Spring', 5: 'Spring',
-            6: 'Summer', 7: 'Summer', 8: 'Summer',
-            9: 'Fall', 10: 'Fall', 11: 'Fall'
-        })
-        
-        pivot = pd.crosstab(self.df['year'], self.df['season'])[['Winter', 'Spring', 'Summer', 'Fall']]
+        years = self._yearly.index.to_numpy()
+        season_idx = self.df['season'].cat.codes.to_numpy()
+        pivot = np.zeros((len(years), 4), dtype=np.int32)
+        np.add.at(pivot, (np.searchsorted(years, self.df['year'].to_numpy()), season_idx), 1)
         
         fig.add_trace(
             go.Heatmap(
-                z=pivot.values,
-                x=['Winter', 'Spring', 'Summer', 'Fall'],
-                y=pivot.index,
+                z=pivot,
+                x=SEASONS,
+                y=years,
                 colorscale='Reds',
                 colorbar=dict(title='Events', len=0.4, y=0.2),
-                text=pivot.values,
+                text=pivot,
                 texttemplate='%{text}',
                 textfont=dict(size=10)
             ),
@@ -396,14 +538,12 @@ class PolicyVisualizationSuite:
         fig.update_xaxes(title_text='Season', row=2, col=1)
         fig.update_yaxes(title_text='Year', row=2, col=1)
         
-        fig.update_layout(
+        fig.update_layout(**self._base_layout(
             title_text='<b>Temporal Risk Evolution Analysis</b>',
-            title_font_size=20,
-            showlegend=False,
             height=900
-        )
+        ))
         
-        fig.write_html(f'{self.output_dir}/03_temporal_risk_analysis.html')
+        fig.write_html(f'{self.output_dir}/03_temporal_risk_analysis.html', include_plotlyjs='cdn', validate=False)
         print("    ✓ Saved: 03_temporal_risk_analysis.html")
     
     # ========== GEOGRAPHIC INTELLIGENCE ==========
@@ -413,17 +553,18 @@ class PolicyVisualizationSuite:
         print("  Creating 3D Geographic Intelligence Globe...")
         
         # Sample for performance
-        sample_size = min(2000, len(self.df))
-        df_sample = self.df.sample(sample_size, random_state=42)
+        df_sample = self._sample_2k
         
         fig = go.Figure()
         
         # Get top 3 categories only
-        top_cats = self.df['category_title'].value_counts().head(3).index
+        top_cats = self._cat_counts.head(3).index
         colors = ['#FF6B6B', '#4ECDC4', '#45B7D1']
         
+        # Split the sample by category in one pass
+        groups = dict(iter(df_sample.groupby('category_title', observed=True)))
         for i, cat in enumerate(top_cats):
-            cat_data = df_sample[df_sample['category_title'] == cat]
+            cat_data = groups.get(cat, df_sample.iloc[:0])
             
             fig.add_trace(go.Scattergeo(
                 lon=cat_data['longitude'],
@@ -440,16 +581,11 @@ class PolicyVisualizationSuite:
                 hovertemplate='<b>%{text}</b><br>Category: ' + cat + '<extra></extra>'
             ))
         
-        fig.update_layout(
-            title=dict(
-                text=f'<b>3D Geographic Intelligence ({self.start_date.year}-{self.end_date.year})</b>',
-                font=dict(size=20)
-            ),
+        fig.update_layout(**self._base_layout(
+            title_text=f'<b>3D Geographic Intelligence ({self.start_date.year}-{self.end_date.year})</b>',
             geo=dict(
+                **GEO_STYLE,
                 projection_type='orthographic',
-                showland=True,
-                landcolor='rgb(243, 243, 243)',
-                coastlinecolor='rgb(204, 204, 204)',
                 showocean=True,
                 oceancolor='rgb(230, 245, 255)',
                 showcountries=True,
@@ -466,38 +602,15 @@ class PolicyVisualizationSuite:
                 bgcolor="rgba(255,255,255,0.9)",
                 font=dict(size=12)
             )
-        )
+        ))
         
-        fig.write_html(f'{self.output_dir}/04_3d_intelligence_globe.html')
+        fig.write_html(f'{self.output_dir}/04_3d_intelligence_globe.html', include_plotlyjs='cdn', validate=False)
         print("    ✓ Saved: 04_3d_intelligence_globe.html")
     
     def create_regional_impact_analysis(self):
         """Regional impact breakdown"""
         print("  Creating Regional Impact Analysis...")
         
-        # Define meaningful regions
-        def assign_region(row):
-            lat, lon = row['latitude'], row['longitude']
-            if -170 < lon < -50:
-                if lat > 15:
-                    return 'North America'
-                else:
-                    return 'South America'
-            elif -20 < lon < 60:
-                if lat > 35:
-                    return 'Europe'
-                else:
-                    return 'Africa'
-            elif 60 < lon < 150:
-                if lat > 0:
-                    return 'Asia'
-                else:
-                    return 'Oceania'
-            else:
-                return 'Other'
-        
-        self.df['region'] = self.df.apply(assign_region, axis=1)
-        
         fig = make_subplots(
             rows=1, cols=2,
             subplot_titles=(
@@ -509,7 +622,7 @@ class PolicyVisualizationSuite:
         )
         
         # Regional distribution
-        region_counts = self.df['region'].value_counts().sort_values(ascending=True)
+        region_counts = self._region_counts.sort_values(ascending=True)
         
         fig.add_trace(
             go.Bar(
@@ -524,10 +637,10 @@ class PolicyVisualizationSuite:
             row=1, col=1
         )
         
-        # Regional trends
+        # Regional trends (one year x region table for all regions)
+        yearly_by_region = pd.crosstab(self.df['year'], self.df['region'])
         for region in region_counts.head(5).index:
-            region_data = self.df[self.df['region'] == region]
-            yearly = region_data.groupby('year').size()
+            yearly = yearly_by_region[region]
             
             fig.add_trace(
                 go.Scatter(
@@ -546,15 +659,14 @@ class PolicyVisualizationSuite:
         fig.update_xaxes(title_text='Year', row=1, col=2)
         fig.update_yaxes(title_text='Events', row=1, col=2)
         
-        fig.update_layout(
+        fig.update_layout(**self._base_layout(
             title_text='<b>Regional Impact Analysis</b>',
-            title_font_size=20,
             showlegend=True,
             height=600,
             legend=dict(font=dict(size=11))
-        )
+        ))
         
-        fig.write_html(f'{self.output_dir}/05_regional_impact_analysis.html')
+        fig.write_html(f'{self.output_dir}/05_regional_impact_analysis.html', include_plotlyjs='cdn', validate=False)
         print("    ✓ Saved: 05_regional_impact_analysis.html")
     
     # ========== PREDICTIVE INSIGHTS ==========
@@ -563,7 +675,7 @@ class PolicyVisualizationSuite:
         """Trend analysis with forecast indicators"""
         print("  Creating Trend Forecasting Analysis...")
         
-        yearly = self.df.groupby('year').size()
+        yearly = self._yearly
         
         # Simple linear trend
         years = yearly.index.values
@@ -614,35 +726,31 @@ class PolicyVisualizationSuite:
             font=dict(size=14)
         )
         
-        fig.update_layout(
-            title=f'<b>Event Frequency Trend & Forecast ({self.start_date.year}-{self.end_date.year})</b>',
-            title_font_size=20,
+        fig.update_layout(**self._base_layout(
+            title_text=f'<b>Event Frequency Trend & Forecast ({self.start_date.year}-{self.end_date.year})</b>',
             xaxis_title='Year',
             yaxis_title='Number of Events',
             height=600,
             showlegend=True,
             legend=dict(font=dict(size=12))
-        )
+        ))
         
-        fig.write_html(f'{self.output_dir}/06_trend_forecasting.html')
+        fig.write_html(f'{self.output_dir}/06_trend_forecasting.html', include_plotlyjs='cdn', validate=False)
         print("    ✓ Saved: 06_trend_forecasting.html")
     
     def create_seasonal_risk_calendar(self):
         """Seasonal risk calendar for planning"""
         print("  Creating Seasonal Risk Calendar...")
         
-        # Create month-day heatmap
-        self.df['month_day'] = self.df['datetime'].dt.strftime('%m-%d')
-        
-        # Aggregate by month and day of month
-        self.df['day_of_month'] = self.df['datetime'].dt.day
-        pivot = pd.crosstab(self.df['month'], self.df['day_of_month'])
+        # Create month-day heatmap, aggregated by month and day of month
+        pivot = np.zeros((12, 31), dtype=np.int32)
+        np.add.at(pivot, (self.df['month'].to_numpy() - 1, self.df['day_of_month'].to_numpy() - 1), 1)
         
         month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
                       'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
         
         fig = go.Figure(data=go.Heatmap(
-            z=pivot.values,
+            z=pivot,
             x=list(range(1, 32)),
             y=month_names,
             colorscale='Reds',
@@ -650,15 +758,14 @@ class PolicyVisualizationSuite:
             hovertemplate='<b>%{y} %{x}</b><br>Events: %{z}<extra></extra>'
         ))
         
-        fig.update_layout(
-            title='<b>Seasonal Risk Calendar: When Events Occur</b>',
-            title_font_size=20,
+        fig.update_layout(**self._base_layout(
+            title_text='<b>Seasonal Risk Calendar: When Events Occur</b>',
             xaxis_title='Day of Month',
             yaxis_title='Month',
             height=600
-        )
+        ))
         
-        fig.write_html(f'{self.output_dir}/07_seasonal_risk_calendar.html')
+        fig.write_html(f'{self.output_dir}/07_seasonal_risk_calendar.html', include_plotlyjs='cdn', validate=False)
         print("    ✓ Saved: 07_seasonal_risk_calendar.html")
     
     # ========== POLICY REPORT ==========
@@ -675,9 +782,23 @@ class PolicyVisualizationSuite:
         
         # Panel 1: Geographic Distribution
         ax1 = fig.add_subplot(gs[0:2, 0:2])
-        scatter = ax1.scatter(self.df['longitude'], self.df['latitude'],
-                            c=self.df['year'], cmap='YlOrRd',
-                            s=15, alpha=0.6, edgecolors='black', linewidth=0.3)
+        
+        # Rasterize to 1° cells coloured by mean event year, so drawing cost
+        # does not grow with the number of events
+        lon = self.df['longitude'].to_numpy()
+        lat = self.df['latitude'].to_numpy()
+        year = self.df['year'].to_numpy()
+        extent = [np.floor(lon.min()), np.ceil(lon.max()), np.floor(lat.min()), np.ceil(lat.max())]
+        bins = [max(int(extent[3] - extent[2]), 1), max(int(extent[1] - extent[0]), 1)]
+        hist_range = [extent[2:], extent[:2]]
+        counts, _, _ = np.histogram2d(lat, lon, bins=bins, range=hist_range)
+        year_sum, _, _ = np.histogram2d(lat, lon, bins=bins, range=hist_range, weights=year)
+        with np.errstate(invalid='ignore'):
+            mean_year = np.ma.masked_invalid(year_sum / counts)
+        
+        scatter = ax1.imshow(mean_year, extent=extent, origin='lower', aspect='auto',
+                             cmap='YlOrRd', vmin=year.min(), vmax=year.max(),
+                             interpolation='nearest', rasterized=True)
         ax1.set_xlabel('Longitude', fontsize=14, fontweight='bold')
         ax1.set_ylabel('Latitude', fontsize=14, fontweight='bold')
         ax1.set_title(f'A. Global Distribution of {len(self.df):,} Events',
@@ -688,7 +809,7 @@ class PolicyVisualizationSuite:
         
         # Panel 2: Category Breakdown (clean)
         ax2 = fig.add_subplot(gs[0, 2])
-        cat_counts = self.df['category_title'].value_counts().head(5)
+        cat_counts = self._cat_counts.head(5)
         colors = plt.cm.Set3(range(len(cat_counts)))
         
         # Truncate labels
@@ -701,7 +822,7 @@ class PolicyVisualizationSuite:
         
         # Panel 3: Temporal Trend
         ax3 = fig.add_subplot(gs[1, 2])
-        yearly = self.df.groupby('year').size()
+        yearly = self._yearly
         ax3.plot(yearly.index, yearly.values, marker='o', linewidth=3,
                 color='#FF6B6B', markersize=8)
         ax3.fill_between(yearly.index, yearly.values, alpha=0.3, color='#FF6B6B')
@@ -712,7 +833,7 @@ class PolicyVisualizationSuite:
         
         # Panel 4: Monthly Pattern
         ax4 = fig.add_subplot(gs[2, 0])
-        monthly = self.df['month'].value_counts().sort_index()
+        monthly = self._monthly
         month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
                       'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
         ax4.bar(month_names, [monthly.get(i, 0) for i in range(1, 13)],
@@ -725,7 +846,7 @@ class PolicyVisualizationSuite:
         
         # Panel 5: Regional Distribution
         ax5 = fig.add_subplot(gs[2, 1])
-        region_counts = self.df['region'].value_counts().head(5)
+        region_counts = self._region_counts.head(5)
         ax5.barh(range(len(region_counts)), region_counts.values,
                 color='#45B7D1', edgecolor='black')
         ax5.set_yticks(range(len(region_counts)))
@@ -742,8 +863,8 @@ class PolicyVisualizationSuite:
         # Calculate key metrics
         total_events = len(self.df)
         avg_per_year = total_events / max(self.date_range_years, 1)
-        top_category = self.df['category_title'].value_counts().index[0]
-        top_category_pct = (self.df['category_title'].value_counts().iloc[0] / total_events) * 100
+        top_category = self._cat_counts.index[0]
+        top_category_pct = (self._cat_counts.iloc[0] / total_events) * 100
         
         metrics_text = f"""
 KEY METRICS
@@ -768,9 +889,10 @@ Lon: {self.df['longitude'].min():.1f}° to {self.df['longitude'].max():.1f}°
         ax6.set_title('F. Summary Metrics', fontsize=14, fontweight='bold')
         
         plt.savefig(f'{self.output_dir}/08_policy_report.png',
-                   dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close()
-        print("    ✓ Saved: 08_policy_report.png (300 DPI)")
+                   dpi=DPI, bbox_inches='tight', facecolor='white')
+        fig.clear()
+        plt.close(fig)
+        print(f"    ✓ Saved: 08_policy_report.png ({DPI} DPI)")
     
     def print_summary(self):
         """Print summary of generated files"""
@@ -807,38 +929,126 @@ Lon: {self.df['longitude'].min():.1f}° to {self.df['longitude'].max():.1f}°
         print("="*80 + "\n")
 
 
+def load_events(csv_path='eonet_cleaned.csv', parquet_path='eonet_cleaned.parquet'):
+    """Load cleaned events, preferring the Parquet copy when it is up to date"""
+    if parquet_is_fresh(csv_path, parquet_path):
+        print(f"Reading {parquet_path}")
+        # Memory-mapped so warm reruns are served straight from the page cache
+        df = pd.read_parquet(parquet_path, engine='pyarrow', columns=EVENT_COLUMNS,
+                             memory_map=True)
+    else:
+        df = _parse_events_csv(csv_path)
+    
+    # Arrow/Parquet normally deliver typed timestamps already
+    if not pd.api.types.is_datetime64_any_dtype(df['datetime']):
+        df['datetime'] = pd.to_datetime(df['datetime'], format='ISO8601', cache=True)
+    
+    # Downcast any numeric columns that arrived at full width
+    for col in df.select_dtypes('float64').columns:
+        df[col] = pd.to_numeric(df[col], downcast='float')
+    for col in df.select_dtypes('int64').columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    
+    # Repetitive string columns (e.g. category_title) become integer codes
+    for col in df.select_dtypes(include=['object', 'string']).columns:
+        if df[col].nunique() < 0.5 * len(df):
+            df[col] = df[col].astype('category')
+    return df
+
+
+def _parse_events_csv(csv_path):
+    """Stream the needed columns of the cleaned CSV (01 owns the Parquet copy)"""
+    # Arrow's CSV reader yields 8 MiB record batches, so only one raw block is
+    # in memory at a time. Every column gets an explicit type: nothing is
+    # inferred from the first block, so a later block can never disagree.
+    # datetime stays a string here; load_events parses it once, cached
+    print(f"Parsing {csv_path}")
+    with open(csv_path, 'rb', buffering=8 << 20) as fh:
+        # Large buffer plus a sequential-access hint for the page cache
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(fh.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        
+        reader = pacsv.open_csv(
+            fh,
+            read_options=pacsv.ReadOptions(use_threads=True, block_size=8 << 20),
+            convert_options=pacsv.ConvertOptions(
+                include_columns=EVENT_COLUMNS,
+                column_types={'title': pa.string(), 'category_title': pa.string(),
+                              'latitude': pa.float32(), 'longitude': pa.float32(),
+                              'datetime': pa.string()}
+            )
+        )
+        batches = list(reader)
+    return pa.Table.from_batches(batches, schema=reader.schema).to_pandas()
+
+
+def _input_key(csv_path='eonet_cleaned.csv', parquet_path='eonet_cleaned.parquet'):
+    """Cheap fingerprint of the input data, this script, its shared helpers and the output DPI"""
+    # 01 writes the CSV and the Parquet copy together, so the CSV stats stand
+    # for both; only fall back to the Parquet stats when there is no CSV
+    source = csv_path if os.path.exists(csv_path) else parquet_path
+    key = hashlib.blake2b(f'dpi={DPI}'.encode(), digest_size=8)
+    for path in (source, __file__, eonet_common.__file__):
+        if os.path.exists(path):
+            st = os.stat(path)
+            key.update(f'{path}:{st.st_size}:{st.st_mtime_ns};'.encode())
+    return key.hexdigest()
+
+
 def main():
     """Main execution"""
-    print("\n" + "="*80)
-    print("POLICY-FOCUSED VISUALIZATION SUITE")
-    print("="*80 + "\n")
+    parser = argparse.ArgumentParser(description="Policy-focused geospatial visualization suite")
+    parser.add_argument('--force', action='store_true',
+                        help='Rebuild all charts even if the input data is unchanged')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Chart worker processes (default: EONET_WORKERS, else 1 = sequential)')
+    args = parser.parse_args()
+    
+    sys.stdout.write("\n" + "="*80 + "\nPOLICY-FOCUSED VISUALIZATION SUITE\n" + "="*80 + "\n\n")
     
     try:
+        # Skip the whole run when the inputs match the last successful one
+        input_key = _input_key()
+        sentinel = os.path.join(CACHE_DIR, f'{input_key}.done')
+        outputs_present = all(os.path.exists(os.path.join('policy_visualizations', name))
+                              for name in OUTPUT_FILES)
+        if not args.force and os.path.exists(sentinel) and outputs_present:
+            print("Input unchanged since the last run - charts are up to date (cached).")
+            print("Use --force to rebuild.\n")
+            return
+        
         # Load data
         print("Loading data...")
-        df = pd.read_csv('eonet_cleaned.csv')
-        df['datetime'] = pd.to_datetime(df['datetime'])
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            # Arrow parses off the GIL, so warm up plotly's default template
+            # (loaded lazily from disk) while the data loads
+            future = pool.submit(load_events)
+            pio.templates[pio.templates.default]
+            df = future.result()
         
         print(f"Loaded {len(df):,} events\n")
         
         # Create visualizer
-        visualizer = PolicyVisualizationSuite(df)
+        visualizer = PolicyVisualizationSuite(df, cache_key=input_key)
         
         # Generate all visualizations
-        visualizer.create_all_visualizations()
+        visualizer.create_all_visualizations(workers=args.workers)
         
-        print("\n" + "="*80)
-        print("MISSION ACCOMPLISHED")
-        print("="*80)
-        print("\nReady for Mars-Earth policy recommendations!")
-        print("\n")
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        open(sentinel, 'w').close()
+        # Only the latest run's sentinel is kept
+        _prune_cache(sentinel, '', '.done')
+        
+        sys.stdout.write("\n" + "="*80 + "\nMISSION ACCOMPLISHED\n" + "="*80 +
+                         "\n\nReady for Mars-Earth policy recommendations!\n\n\n")
         
     except FileNotFoundError:
-        print("\nERROR: eonet_cleaned.csv not found!")
+        print("\nERROR: eonet_cleaned.csv / eonet_cleaned.parquet not found!")
         print("Please run 01_data_loading.py first.\n")
-    except Exception as e:
+    except (KeyError, ValueError) as e:
+        # Missing columns or malformed data (pyarrow.ArrowInvalid is a ValueError);
+        # anything else is a bug and propagates with its own traceback
         print(f"\nERROR: {e}\n")
-        import traceback
         traceback.print_exc()
 
 
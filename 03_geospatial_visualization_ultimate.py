@@ -17,16 +17,21 @@ Features:
 
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 import folium
 from folium.plugins import HeatMap, MarkerCluster, TimestampedGeoJson, MiniMap
 import seaborn as sns
 from datetime import datetime, timedelta
+from itertools import islice
 import json
 import os
+from eonet_common import load_cleaned, worker_count, hist2d, binned_kde, cell_ids
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -34,11 +39,78 @@ warnings.filterwarnings('ignore')
 plt.style.use('seaborn-v0_8-darkgrid')
 sns.set_palette("husl")
 
+# orjson serializes the figure JSON several times faster than the stdlib encoder
+pio.json.config.default_engine = 'orjson'
+
+# Publication PNGs: 200 DPI with light compression; set EONET_DPI=300 for print
+DPI = int(os.environ.get('EONET_DPI', 200))
+PNG_KW = {'compress_level': 3}
+# Points per category in the static scatter maps
+MAX_SCATTER = 5000
+
+# Category colours for the merged multi-category traces
+CATEGORY_COLORS = px.colors.qualitative.Plotly
+
+# Season by month number (index 0 unused)
+SEASONS = ['Winter', 'Spring', 'Summer', 'Fall']
+SEASON_LUT = np.array(['', 'Winter', 'Winter', 'Spring', 'Spring', 'Spring', 'Summer',
+                       'Summer', 'Summer', 'Fall', 'Fall', 'Fall', 'Winter'])
+
+N_CELLS = 180 * 360
+
+def _occupied(counts):
+    """Occupied cells of a per-cell count grid: (centre lon, centre lat, counts)"""
+    cell = np.flatnonzero(counts)
+    return cell % 360 - 180 + 0.5, cell // 360 - 90 + 0.5, counts[cell]
+
+def _cells(lon, lat):
+    """Collapse points to occupied 1° cells: (centre lon, centre lat, counts)"""
+    return _occupied(np.bincount(cell_ids(lon, lat), minlength=N_CELLS))
+
 class UltimateGeoVisualizer:
     """The most advanced geospatial visualizer ever created"""
     
     def __init__(self, df):
-        self.df = df
+        # Events without a timestamp cannot be placed on any time axis (and
+        # would sort last, becoming the "latest" event)
+        missing = df['datetime'].isna()
+        if missing.any():
+            print(f"Dropping {missing.sum():,} events without a date")
+            df = df[~missing]
+        
+        # Chronological order lets time splits be a searchsorted + slice
+        self.df = df = df.sort_values('datetime', kind='stable', ignore_index=True)
+        self._dt = df['datetime'].to_numpy()
+        
+        # Derived temporal columns, computed once and shared by every chart
+        dt = df['datetime'].dt
+        df['year'] = df['year'].astype('int16')
+        df['month'] = df['month'].astype('int8')
+        # year_month from integer yyyymm keys; only the unique months are
+        # formatted as strings (categorical labels for the animation frames)
+        ym_key = (dt.year * 100 + dt.month).to_numpy(dtype=np.int32)
+        codes, months = pd.factorize(ym_key, sort=True)
+        df['year_month'] = pd.Categorical.from_codes(
+            codes, [f'{m // 100}-{m % 100:02d}' for m in months])
+        df['date'] = dt.normalize()
+        df['week'] = dt.isocalendar().week.astype('int16')
+        df['season'] = pd.Categorical(SEASON_LUT[df['month'].to_numpy()], categories=SEASONS)
+        
+        # Repeated string columns as categoricals (int codes for groupby/value_counts)
+        for col in ['category_title', 'category_simple', 'day_of_week']:
+            df[col] = df[col].astype('category')
+        
+        # float32 coordinates are ample for plotting and halve the bytes every
+        # chart streams through; also kept as arrays for the NumPy-side binning
+        df['latitude'] = df['latitude'].astype('float32')
+        df['longitude'] = df['longitude'].astype('float32')
+        self.lon = df['longitude'].to_numpy()
+        self.lat = df['latitude'].to_numpy()
+        
+        # Row positions per category (first-appearance order), from one groupby pass
+        self.cat_idx = df.groupby('category_title', sort=False, observed=True).indices
+        self._precompute_stats()
+        
         self.output_dir = 'ultimate_geospatial'
         os.makedirs(self.output_dir, exist_ok=True)
         
@@ -58,6 +130,23 @@ class UltimateGeoVisualizer:
         print(f"🗂️  Categories: {df['category_title'].nunique()}")
         print("="*80 + "\n")
     
+    def _precompute_stats(self):
+        """Aggregates shared by the dashboard and publication panels, computed once"""
+        self._cat_counts = self.df['category_title'].value_counts()
+        # Year x month counts (all 12 months); yearly and monthly totals are its margins
+        self._year_month_pivot = (self.df.groupby(['year', 'month']).size()
+                                  .unstack(fill_value=0)
+                                  .reindex(columns=range(1, 13), fill_value=0))
+        self._yearly_counts = self._year_month_pivot.sum(axis=1)
+        self._month_counts = self._year_month_pivot.sum(axis=0)
+        self._lat_hist = np.histogram(self.lat, bins=50)
+        self._lat_mean = float(self.lat.mean(dtype=np.float64))
+    
+    def _sample_arrays(self, k, cols):
+        """Random sample of up to k rows as NumPy arrays (no DataFrame rebuild)"""
+        idx = np.random.default_rng(42).choice(len(self.df), size=min(k, len(self.df)), replace=False)
+        return {c: self.df[c].to_numpy()[idx] for c in cols}
+    
     def create_all_visualizations(self):
         """Generate ALL ultimate visualizations"""
         
@@ -119,23 +208,25 @@ class UltimateGeoVisualizer:
         print("  🌍 Creating 3D Interactive Globe...")
         
         # Sample data for performance
-        df_sample = self.df.sample(min(2000, len(self.df)), random_state=42)
+        sample = self._sample_arrays(2000, ['longitude', 'latitude', 'title', 'category_title'])
         
         fig = go.Figure()
         
-        # Add events as 3D scatter
-        for category in df_sample['category_title'].unique()[:5]:
-            cat_data = df_sample[df_sample['category_title'] == category]
-            
+        # Add events as 3D scatter: one trace per category (first 5, in order of
+        # appearance) so the legend toggles them; one factorize pass splits them
+        codes, categories = pd.factorize(sample['category_title'])
+        for i, category in enumerate(categories[:5]):
+            mask = codes == i
             fig.add_trace(go.Scattergeo(
-                lon=cat_data['longitude'],
-                lat=cat_data['latitude'],
-                text=cat_data['title'],
+                lon=sample['longitude'][mask],
+                lat=sample['latitude'][mask],
+                text=sample['title'][mask],
                 name=category,
                 mode='markers',
                 marker=dict(
                     size=8,
                     opacity=0.8,
+                    color=CATEGORY_COLORS[i],
                     line=dict(width=0.5, color='white')
                 )
             ))
@@ -171,30 +262,30 @@ class UltimateGeoVisualizer:
             )
         )
         
-        fig.write_html(f'{self.output_dir}/3d_visualizations/3d_globe_interactive.html')
+        fig.write_html(f'{self.output_dir}/3d_visualizations/3d_globe_interactive.html', include_plotlyjs='cdn', validate=False)
         print("    ✓ Saved: 3d_globe_interactive.html")
     
     def create_3d_scatter_plot(self):
         """Create 3D scatter plot with time dimension"""
         print("  📍 Creating 3D Scatter Plot (Lat, Lon, Time)...")
         
-        df_sample = self.df.sample(min(1000, len(self.df)), random_state=42).copy()
-        df_sample['days_since_start'] = (df_sample['datetime'] - df_sample['datetime'].min()).dt.days
+        sample = self._sample_arrays(1000, ['longitude', 'latitude', 'title', 'datetime'])
+        days_since_start = (sample['datetime'] - sample['datetime'].min()).astype('timedelta64[D]').astype(np.int32)
         
         fig = go.Figure(data=[go.Scatter3d(
-            x=df_sample['longitude'],
-            y=df_sample['latitude'],
-            z=df_sample['days_since_start'],
+            x=sample['longitude'],
+            y=sample['latitude'],
+            z=days_since_start,
             mode='markers',
             marker=dict(
                 size=5,
-                color=df_sample['days_since_start'],
+                color=days_since_start,
                 colorscale='Viridis',
                 showscale=True,
                 colorbar=dict(title="Days Since Start"),
                 opacity=0.8
             ),
-            text=df_sample['title'],
+            text=sample['title'],
             hovertemplate='<b>%{text}</b><br>Lon: %{x}<br>Lat: %{y}<br>Day: %{z}<extra></extra>'
         )])
         
@@ -209,7 +300,7 @@ class UltimateGeoVisualizer:
             height=800
         )
         
-        fig.write_html(f'{self.output_dir}/3d_visualizations/3d_spacetime_scatter.html')
+        fig.write_html(f'{self.output_dir}/3d_visualizations/3d_spacetime_scatter.html', include_plotlyjs='cdn', validate=False)
         print("    ✓ Saved: 3d_spacetime_scatter.html")
     
     def create_3d_density_surface(self):
@@ -217,19 +308,15 @@ class UltimateGeoVisualizer:
         print("  🗻 Creating 3D Density Surface...")
         
         # Create 2D histogram
-        lon_bins = np.linspace(self.df['longitude'].min(), self.df['longitude'].max(), 50)
-        lat_bins = np.linspace(self.df['latitude'].min(), self.df['latitude'].max(), 50)
-        
-        H, xedges, yedges = np.histogram2d(
-            self.df['longitude'], 
-            self.df['latitude'], 
-            bins=[lon_bins, lat_bins]
-        )
+        lon, lat = self.lon, self.lat
+        H, xedges, yedges = hist2d(lon, lat, (49, 49),
+                                   (lon.min(), lon.max()), (lat.min(), lat.max()))
         
+        # Plot counts at bin centres so x/y line up with z
         fig = go.Figure(data=[go.Surface(
             z=H.T,
-            x=xedges,
-            y=yedges,
+            x=(xedges[:-1] + xedges[1:]) / 2,
+            y=(yedges[:-1] + yedges[1:]) / 2,
             colorscale='Hot',
             colorbar=dict(title='Event Density')
         )])
@@ -245,7 +332,7 @@ class UltimateGeoVisualizer:
             height=800
         )
         
-        fig.write_html(f'{self.output_dir}/3d_visualizations/3d_density_surface.html')
+        fig.write_html(f'{self.output_dir}/3d_visualizations/3d_density_surface.html', include_plotlyjs='cdn', validate=False)
         print("    ✓ Saved: 3d_density_surface.html")
     
     # ==================== DASHBOARDS ====================
@@ -270,29 +357,37 @@ class UltimateGeoVisualizer:
             horizontal_spacing=0.1
         )
         
-        # 1. Global scatter
-        top_cats = self.df['category_title'].value_counts().head(3).index
-        for cat in top_cats:
-            cat_data = self.df[self.df['category_title'] == cat]
-            # Sample correctly - can't sample more than category has
-            sample_size = min(500, len(cat_data))
-            cat_data = cat_data.sample(sample_size, random_state=42) if len(cat_data) > 0 else cat_data
+        # 1. Global scatter - each category binned to 1° cells, so every event
+        # counts while the marker count stays bounded regardless of N
+        # One trace per category, so its legend entry toggles its cells
+        top_cats = self._cat_counts.head(3).index
+        for i, cat in enumerate(top_cats):
+            idx = self.cat_idx[cat]
+            cell_lon, cell_lat, counts = _cells(self.lon[idx], self.lat[idx])
             fig.add_trace(
                 go.Scattergeo(
-                    lon=cat_data['longitude'],
-                    lat=cat_data['latitude'],
+                    lon=cell_lon,
+                    lat=cell_lat,
+                    customdata=counts,
                     name=cat,
                     mode='markers',
-                    marker=dict(size=4, opacity=0.6)
+                    marker=dict(size=3 + 5 * np.sqrt(counts / counts.max()), opacity=0.6,
+                                color=CATEGORY_COLORS[i]),
+                    hovertemplate='Lat: %{lat:.1f}<br>Lon: %{lon:.1f}<br>Events: %{customdata}'
                 ),
                 row=1, col=1
             )
         
+        # The time series, monthly pattern, yearly totals and heatmap are all
+        # cheap reductions of the cached year x month matrix
+        year_month = self._year_month_pivot
+        
         # 2. Events over time
-        monthly = self.df.groupby(self.df['datetime'].dt.to_period('M')).size()
+        monthly = year_month.stack()
+        monthly = monthly[monthly > 0]
         fig.add_trace(
             go.Scatter(
-                x=monthly.index.astype(str),
+                x=[f'{y}-{m:02d}' for y, m in monthly.index],
                 y=monthly.values,
                 mode='lines+markers',
                 name='Monthly Events',
@@ -302,7 +397,7 @@ class UltimateGeoVisualizer:
         )
         
         # 3. Top categories
-        cat_counts = self.df['category_title'].value_counts().head(5)
+        cat_counts = self._cat_counts.head(5)
         fig.add_trace(
             go.Bar(
                 x=cat_counts.values,
@@ -314,28 +409,29 @@ class UltimateGeoVisualizer:
         )
         
         # 4. Monthly pattern
-        month_counts = self.df['month'].value_counts().sort_index()
         fig.add_trace(
             go.Bar(
                 x=list(range(1, 13)),
-                y=[month_counts.get(i, 0) for i in range(1, 13)],
+                y=self._month_counts.values,
                 name='By Month'
             ),
             row=2, col=2
         )
         
-        # 5. Latitude distribution
+        # 5. Latitude distribution (pre-binned, so the raw column is not embedded)
+        lat_hist, lat_edges = self._lat_hist
         fig.add_trace(
-            go.Histogram(
-                x=self.df['latitude'],
-                nbinsx=50,
+            go.Bar(
+                x=(lat_edges[:-1] + lat_edges[1:]) / 2,
+                y=lat_hist,
+                width=np.diff(lat_edges),
                 name='Latitude'
             ),
             row=2, col=3
         )
         
         # 6. Year-over-year
-        yearly = self.df.groupby('year').size()
+        yearly = self._yearly_counts
         fig.add_trace(
             go.Scatter(
                 x=yearly.index,
@@ -348,12 +444,11 @@ class UltimateGeoVisualizer:
         )
         
         # 7. Heatmap (year vs month)
-        pivot = pd.crosstab(self.df['year'], self.df['month'])
         fig.add_trace(
             go.Heatmap(
-                z=pivot.values,
+                z=year_month.values,
                 x=list(range(1, 13)),
-                y=pivot.index,
+                y=year_month.index,
                 colorscale='YlOrRd',
                 showscale=False
             ),
@@ -385,17 +480,13 @@ class UltimateGeoVisualizer:
             )
         )
         
-        fig.write_html(f'{self.output_dir}/dashboards/master_dashboard.html')
+        fig.write_html(f'{self.output_dir}/dashboards/master_dashboard.html', include_plotlyjs='cdn', validate=False)
         print("    ✓ Saved: master_dashboard.html")
     
     def create_temporal_dashboard(self):
         """Create time-focused interactive dashboard"""
         print("  ⏰ Creating Temporal Analysis Dashboard...")
         
-        # Prepare temporal data
-        self.df['year_month'] = self.df['datetime'].dt.to_period('M')
-        self.df['week'] = self.df['datetime'].dt.isocalendar().week
-        
         fig = make_subplots(
             rows=2, cols=2,
             subplot_titles=(
@@ -411,7 +502,7 @@ class UltimateGeoVisualizer:
         )
         
         # Cumulative events
-        daily = self.df.groupby(self.df['datetime'].dt.date).size().cumsum()
+        daily = self.df.groupby('date').size().cumsum()
         fig.add_trace(
             go.Scatter(
                 x=daily.index,
@@ -449,14 +540,7 @@ class UltimateGeoVisualizer:
         )
         
         # Seasonal sunburst
-        self.df['season'] = self.df['month'].map({
-            12: 'Winter', 1: 'Winter', 2: 'Winter',
-            3: 'Spring', 4: 'Spring', 5: 'Spring',
-            6: 'Summer', 7: 'Summer', 8: 'Summer',
-            9: 'Fall', 10: 'Fall', 11: 'Fall'
-        })
-        
-        season_data = self.df.groupby(['season', 'category_simple']).size().reset_index(name='count')
+        season_data = self.df.groupby(['season', 'category_simple'], observed=True).size().reset_index(name='count')
         fig.add_trace(
             go.Sunburst(
                 labels=season_data['season'].tolist() + season_data['category_simple'].tolist(),
@@ -473,7 +557,7 @@ class UltimateGeoVisualizer:
             height=900
         )
         
-        fig.write_html(f'{self.output_dir}/dashboards/temporal_dashboard.html')
+        fig.write_html(f'{self.output_dir}/dashboards/temporal_dashboard.html', include_plotlyjs='cdn', validate=False)
         print("    ✓ Saved: temporal_dashboard.html")
     
     # ==================== ANIMATIONS ====================
@@ -482,14 +566,11 @@ class UltimateGeoVisualizer:
         """Create cinematic animated timeline with effects"""
         print("  🎬 Creating Cinematic Timeline Animation...")
         
-        # Prepare data
-        df_anim = self.df.copy()
-        df_anim['year_month'] = df_anim['datetime'].dt.to_period('M').astype(str)
-        
-        # Sample for smooth animation
-        df_anim = df_anim.groupby('year_month').apply(
-            lambda x: x.sample(min(200, len(x)), random_state=42)
-        ).reset_index(drop=True)
+        # Sample up to 200 events per month for smooth animation: shuffle once,
+        # keep the first 200 rows of each month, then restore frame order
+        shuffled = self.df.iloc[np.random.default_rng(42).permutation(len(self.df))]
+        df_anim = shuffled[shuffled.groupby('year_month', observed=True).cumcount().to_numpy() < 200]
+        df_anim = df_anim.sort_values('year_month', kind='stable')
         
         fig = px.scatter_geo(
             df_anim,
@@ -524,20 +605,16 @@ class UltimateGeoVisualizer:
         fig.layout.updatemenus[0].buttons[0].args[1]['frame']['duration'] = 200
         fig.layout.updatemenus[0].buttons[0].args[1]['transition']['duration'] = 100
         
-        fig.write_html(f'{self.output_dir}/animations/cinematic_timeline.html')
+        fig.write_html(f'{self.output_dir}/animations/cinematic_timeline.html', include_plotlyjs='cdn', validate=False)
         print("    ✓ Saved: cinematic_timeline.html")
     
     def create_cumulative_animation(self):
         """Create cumulative buildup animation"""
         print("  📈 Creating Cumulative Buildup Animation...")
         
-        # Create cumulative dataset
-        df_sorted = self.df.sort_values('datetime').copy()
-        df_sorted['event_number'] = range(1, len(df_sorted) + 1)
-        df_sorted['year_month'] = df_sorted['datetime'].dt.to_period('M').astype(str)
-        
-        # Sample every 50th event for smooth animation
-        df_cumul = df_sorted[::50].copy()
+        # Sample every 50th event (already in date order) for smooth animation
+        df_cumul = self.df.iloc[::50].copy()
+        df_cumul['event_number'] = np.arange(1, len(self.df) + 1, 50)
         
         fig = px.scatter_geo(
             df_cumul,
@@ -561,7 +638,7 @@ class UltimateGeoVisualizer:
         
         fig.update_layout(height=800, title_font_size=24)
         
-        fig.write_html(f'{self.output_dir}/animations/cumulative_buildup.html')
+        fig.write_html(f'{self.output_dir}/animations/cumulative_buildup.html', include_plotlyjs='cdn', validate=False)
         print("    ✓ Saved: cumulative_buildup.html")
     
     # ==================== STORY MAPS ====================
@@ -591,21 +668,22 @@ class UltimateGeoVisualizer:
             {'name': 'Pacific Storms', 'lat': 20.0, 'lon': 120.0, 'zoom': 4}
         ]
         
-        for i, region in enumerate(hotspot_regions):
-            # Get events in region
-            mask = (
-                ((self.df['latitude'] - region['lat']).abs() < 10) &
-                ((self.df['longitude'] - region['lon']).abs() < 15)
-            )
-            region_events = self.df[mask]
-            
-            if len(region_events) > 0:
+        # Events per region, all regions tested in one broadcast pass
+        centers = np.array([[r['lat'], r['lon']] for r in hotspot_regions])
+        in_region = ((np.abs(self.lat[:, None] - centers[:, 0]) < 10) &
+                     (np.abs(self.lon[:, None] - centers[:, 1]) < 15))
+        region_counts = in_region.sum(axis=0)
+        
+        # Markers and circles go into one layer that is attached to the map once
+        hotspots = folium.FeatureGroup(name='Hotspots')
+        for region, n_events in zip(hotspot_regions, region_counts):
+            if n_events > 0:
                 folium.Marker(
                     location=[region['lat'], region['lon']],
-                    popup=f"<b>{region['name']}</b><br>{len(region_events)} events",
+                    popup=f"<b>{region['name']}</b><br>{n_events} events",
                     icon=folium.Icon(color='red', icon='fire', prefix='fa'),
                     tooltip=f"Click to learn about {region['name']}"
-                ).add_to(m)
+                ).add_to(hotspots)
                 
                 # Add circle
                 folium.Circle(
@@ -614,10 +692,11 @@ class UltimateGeoVisualizer:
                     color='red',
                     fill=True,
                     opacity=0.3
-                ).add_to(m)
+                ).add_to(hotspots)
+        hotspots.add_to(m)
         
         # Add heatmap layer
-        heat_data = [[row['latitude'], row['longitude']] for idx, row in self.df.iterrows()]
+        heat_data = np.column_stack([self.lat, self.lon]).tolist()
         HeatMap(heat_data, radius=10, blur=15).add_to(m)
         
         # Add minimap
@@ -632,9 +711,11 @@ class UltimateGeoVisualizer:
         print("  🔄 Creating Comparison Map (Early vs Recent)...")
         
         # Split data into early and recent
-        mid_date = self.df['datetime'].min() + (self.df['datetime'].max() - self.df['datetime'].min()) / 2
-        early_df = self.df[self.df['datetime'] < mid_date]
-        recent_df = self.df[self.df['datetime'] >= mid_date]
+        first, last = self.df['datetime'].iloc[[0, -1]]
+        mid_date = first + (last - first) / 2
+        split = self._dt.searchsorted(mid_date.to_datetime64())
+        early_df = self.df.iloc[:split]
+        recent_df = self.df.iloc[split:]
         
         fig = make_subplots(
             rows=1, cols=2,
@@ -646,29 +727,24 @@ class UltimateGeoVisualizer:
             horizontal_spacing=0.01
         )
         
-        # Early period
-        fig.add_trace(
-            go.Scattergeo(
-                lon=early_df['longitude'],
-                lat=early_df['latitude'],
-                mode='markers',
-                marker=dict(size=4, color='blue', opacity=0.5),
-                name=f'Early ({len(early_df)} events)'
-            ),
-            row=1, col=1
-        )
-        
-        # Recent period
-        fig.add_trace(
-            go.Scattergeo(
-                lon=recent_df['longitude'],
-                lat=recent_df['latitude'],
-                mode='markers',
-                marker=dict(size=4, color='red', opacity=0.5),
-                name=f'Recent ({len(recent_df)} events)'
-            ),
-            row=1, col=2
-        )
+        # Both periods binned to 1° cells so drawing cost doesn't grow with N
+        for col, (period, period_df, color) in enumerate(
+                [('Early', early_df, 'blue'), ('Recent', recent_df, 'red')], start=1):
+            cell_lon, cell_lat, counts = _cells(period_df['longitude'].to_numpy(),
+                                                period_df['latitude'].to_numpy())
+            fig.add_trace(
+                go.Scattergeo(
+                    lon=cell_lon,
+                    lat=cell_lat,
+                    customdata=counts,
+                    mode='markers',
+                    marker=dict(size=3 + 5 * np.sqrt(counts / counts.max()),
+                                color=color, opacity=0.5),
+                    name=f'{period} ({len(period_df)} events)',
+                    hovertemplate='Lat: %{lat:.1f}<br>Lon: %{lon:.1f}<br>Events: %{customdata}'
+                ),
+                row=1, col=col
+            )
         
         fig.update_geos(
             showland=True,
@@ -683,7 +759,7 @@ class UltimateGeoVisualizer:
             showlegend=True
         )
         
-        fig.write_html(f'{self.output_dir}/story_maps/comparison_map.html')
+        fig.write_html(f'{self.output_dir}/story_maps/comparison_map.html', include_plotlyjs='cdn', validate=False)
         print("    ✓ Saved: comparison_map.html")
     
     # ==================== STATISTICAL MAPS ====================
@@ -692,20 +768,15 @@ class UltimateGeoVisualizer:
         """Create Kernel Density Estimation heatmap"""
         print("  🔥 Creating KDE Heatmap...")
         
-        from scipy.stats import gaussian_kde
-        
         # Prepare data
-        xy = np.vstack([self.df['longitude'], self.df['latitude']])
-        kde = gaussian_kde(xy)
+        lon, lat = self.lon, self.lat
         
         # Create grid
-        lon_grid = np.linspace(self.df['longitude'].min(), self.df['longitude'].max(), 100)
-        lat_grid = np.linspace(self.df['latitude'].min(), self.df['latitude'].max(), 100)
-        lon_mesh, lat_mesh = np.meshgrid(lon_grid, lat_grid)
+        lon_grid = np.linspace(lon.min(), lon.max(), 100)
+        lat_grid = np.linspace(lat.min(), lat.max(), 100)
         
         # Evaluate KDE
-        grid_coords = np.vstack([lon_mesh.ravel(), lat_mesh.ravel()])
-        z = kde(grid_coords).reshape(lon_mesh.shape)
+        z = binned_kde(lon, lat, lon_grid, lat_grid, workers=worker_count())
         
         fig = go.Figure(data=go.Heatmap(
             x=lon_grid,
@@ -722,7 +793,7 @@ class UltimateGeoVisualizer:
             height=700
         )
         
-        fig.write_html(f'{self.output_dir}/statistical_maps/kde_heatmap.html')
+        fig.write_html(f'{self.output_dir}/statistical_maps/kde_heatmap.html', include_plotlyjs='cdn', validate=False)
         print("    ✓ Saved: kde_heatmap.html")
     
     def create_intensity_map(self):
@@ -730,16 +801,14 @@ class UltimateGeoVisualizer:
         print("  💥 Creating Intensity Map with Contours...")
         
         # Create 2D histogram
-        H, xedges, yedges = np.histogram2d(
-            self.df['longitude'],
-            self.df['latitude'],
-            bins=[80, 80]
-        )
+        lon, lat = self.lon, self.lat
+        H, xedges, yedges = hist2d(lon, lat, (80, 80),
+                                   (lon.min(), lon.max()), (lat.min(), lat.max()))
         
         fig = go.Figure(data=go.Contour(
             z=H.T,
-            x=xedges,
-            y=yedges,
+            x=(xedges[:-1] + xedges[1:]) / 2,
+            y=(yedges[:-1] + yedges[1:]) / 2,
             colorscale='Jet',
             contours=dict(
                 showlabels=True,
@@ -764,40 +833,40 @@ class UltimateGeoVisualizer:
             height=700
         )
         
-        fig.write_html(f'{self.output_dir}/statistical_maps/intensity_contours.html')
+        fig.write_html(f'{self.output_dir}/statistical_maps/intensity_contours.html', include_plotlyjs='cdn', validate=False)
         print("    ✓ Saved: intensity_contours.html")
     
     def create_seasonal_comparison(self):
         """Create seasonal pattern comparison"""
         print("  🍂 Creating Seasonal Comparison Map...")
         
-        seasons = {
-            'Winter': [12, 1, 2],
-            'Spring': [3, 4, 5],
-            'Summer': [6, 7, 8],
-            'Fall': [9, 10, 11]
-        }
+        # Per-season 1° cell counts for all four panels in one bincount
+        season_codes = self.df['season'].cat.codes.to_numpy().astype(np.int32)
+        grids = np.bincount(season_codes * N_CELLS + cell_ids(self.lon, self.lat),
+                            minlength=len(SEASONS) * N_CELLS).reshape(len(SEASONS), N_CELLS)
         
         fig = make_subplots(
             rows=2, cols=2,
-            subplot_titles=list(seasons.keys()),
+            subplot_titles=SEASONS,
             specs=[[{'type': 'scattergeo'}, {'type': 'scattergeo'}],
                    [{'type': 'scattergeo'}, {'type': 'scattergeo'}]]
         )
         
         positions = [(1, 1), (1, 2), (2, 1), (2, 2)]
         
-        for (season, months), (row, col) in zip(seasons.items(), positions):
-            season_data = self.df[self.df['month'].isin(months)]
+        for season, grid, (row, col) in zip(SEASONS, grids, positions):
+            cell_lon, cell_lat, counts = _occupied(grid)
             
             fig.add_trace(
                 go.Scattergeo(
-                    lon=season_data['longitude'],
-                    lat=season_data['latitude'],
+                    lon=cell_lon,
+                    lat=cell_lat,
+                    customdata=counts,
                     mode='markers',
-                    marker=dict(size=3, opacity=0.5),
-                    name=f'{season} ({len(season_data)} events)',
-                    showlegend=True
+                    marker=dict(size=3 + 5 * np.sqrt(counts / counts.max(initial=1)), opacity=0.5),
+                    name=f'{season} ({counts.sum()} events)',
+                    showlegend=True,
+                    hovertemplate='Lat: %{lat:.1f}<br>Lon: %{lon:.1f}<br>Events: %{customdata}'
                 ),
                 row=row, col=col
             )
@@ -814,7 +883,7 @@ class UltimateGeoVisualizer:
             height=900
         )
         
-        fig.write_html(f'{self.output_dir}/statistical_maps/seasonal_comparison.html')
+        fig.write_html(f'{self.output_dir}/statistical_maps/seasonal_comparison.html', include_plotlyjs='cdn', validate=False)
         print("    ✓ Saved: seasonal_comparison.html")
     
     # ==================== PUBLICATION READY ====================
@@ -828,19 +897,31 @@ class UltimateGeoVisualizer:
         
         # Panel A: Geographic distribution
         ax1 = fig.add_subplot(gs[0:2, 0:2])
-        scatter = ax1.scatter(self.df['longitude'], self.df['latitude'],
-                             c=self.df['year'], cmap='viridis',
-                             s=10, alpha=0.6, edgecolors='black', linewidth=0.3)
+        
+        # 1° cells coloured by mean event year (one bincount, one colour mapping)
+        # instead of a per-marker coloured scatter
+        cells = cell_ids(self.lon, self.lat)
+        year = self.df['year'].to_numpy()
+        counts = np.bincount(cells, minlength=N_CELLS)
+        year_sum = np.bincount(cells, weights=year, minlength=N_CELLS)
+        with np.errstate(invalid='ignore'):
+            mean_year = np.ma.masked_invalid(year_sum / counts).reshape(180, 360)
+        
+        scatter = ax1.imshow(mean_year, extent=[-180, 180, -90, 90], origin='lower',
+                             aspect='auto', cmap='viridis', vmin=year.min(), vmax=year.max(),
+                             interpolation='nearest', rasterized=True)
+        ax1.set_xlim(np.floor(self.lon.min()), np.ceil(self.lon.max()))
+        ax1.set_ylim(np.floor(self.lat.min()), np.ceil(self.lat.max()))
         ax1.set_xlabel('Longitude', fontsize=14, fontweight='bold')
         ax1.set_ylabel('Latitude', fontsize=14, fontweight='bold')
         ax1.set_title('A. Global Distribution of Natural Events (2002-2025)',
                      fontsize=16, fontweight='bold', pad=10)
         ax1.grid(True, alpha=0.3)
-        plt.colorbar(scatter, ax=ax1, label='Year')
+        plt.colorbar(scatter, ax=ax1, label='Mean Year')
         
         # Panel B: Temporal trend
         ax2 = fig.add_subplot(gs[0, 2])
-        yearly = self.df.groupby('year').size()
+        yearly = self._yearly_counts
         ax2.plot(yearly.index, yearly.values, marker='o', linewidth=2, color='darkblue')
         ax2.fill_between(yearly.index, yearly.values, alpha=0.3, color='lightblue')
         ax2.set_xlabel('Year', fontsize=12, fontweight='bold')
@@ -850,7 +931,7 @@ class UltimateGeoVisualizer:
         
         # Panel C: Category breakdown
         ax3 = fig.add_subplot(gs[1, 2])
-        cat_counts = self.df['category_title'].value_counts().head(5)
+        cat_counts = self._cat_counts.head(5)
         colors_pie = plt.cm.Set3(range(len(cat_counts)))
         ax3.pie(cat_counts.values, labels=cat_counts.index, autopct='%1.1f%%',
                colors=colors_pie, startangle=90)
@@ -858,7 +939,7 @@ class UltimateGeoVisualizer:
         
         # Panel D: Monthly pattern
         ax4 = fig.add_subplot(gs[2, 0])
-        monthly = self.df['month'].value_counts().sort_index()
+        monthly = self._month_counts
         ax4.bar(monthly.index, monthly.values, color='coral', edgecolor='black')
         ax4.set_xlabel('Month', fontsize=12, fontweight='bold')
         ax4.set_ylabel('Event Count', fontsize=12, fontweight='bold')
@@ -868,8 +949,10 @@ class UltimateGeoVisualizer:
         
         # Panel E: Latitude distribution
         ax5 = fig.add_subplot(gs[2, 1])
-        ax5.hist(self.df['latitude'], bins=50, color='skyblue', edgecolor='black')
-        ax5.axvline(self.df['latitude'].mean(), color='red', linestyle='--',
+        lat_hist, lat_edges = self._lat_hist
+        ax5.bar(lat_edges[:-1], lat_hist, width=np.diff(lat_edges), align='edge',
+                color='skyblue', edgecolor='black')
+        ax5.axvline(self._lat_mean, color='red', linestyle='--',
                    linewidth=2, label='Mean')
         ax5.set_xlabel('Latitude', fontsize=12, fontweight='bold')
         ax5.set_ylabel('Frequency', fontsize=12, fontweight='bold')
@@ -879,8 +962,7 @@ class UltimateGeoVisualizer:
         
         # Panel F: Year-Month heatmap
         ax6 = fig.add_subplot(gs[2, 2])
-        pivot = pd.crosstab(self.df['year'], self.df['month'])
-        sns.heatmap(pivot, cmap='YlOrRd', cbar_kws={'label': 'Events'}, ax=ax6)
+        sns.heatmap(self._year_month_pivot, cmap='YlOrRd', cbar_kws={'label': 'Events'}, ax=ax6)
         ax6.set_title('F. Temporal Heatmap', fontsize=14, fontweight='bold')
         ax6.set_xlabel('Month', fontsize=12, fontweight='bold')
         ax6.set_ylabel('Year', fontsize=12, fontweight='bold')
@@ -889,7 +971,7 @@ class UltimateGeoVisualizer:
                     fontsize=22, fontweight='bold', y=0.98)
         
         plt.savefig(f'{self.output_dir}/publication_ready/multi_panel_figure.png',
-                   dpi=300, bbox_inches='tight', facecolor='white')
+                   dpi=DPI, bbox_inches='tight', facecolor='white', pil_kwargs=PNG_KW)
         plt.close()
         print("    ✓ Saved: multi_panel_figure.png (HIGH RESOLUTION)")
     
@@ -903,11 +985,15 @@ class UltimateGeoVisualizer:
         # Main map
         ax_main = fig.add_subplot(gs[:, :2])
         
-        # Plot events with size based on intensity
-        for category in self.df['category_title'].unique()[:5]:
-            cat_data = self.df[self.df['category_title'] == category]
-            ax_main.scatter(cat_data['longitude'], cat_data['latitude'],
-                          label=category, s=20, alpha=0.6, edgecolors='black', linewidth=0.5)
+        # Plot events with size based on intensity (deterministic sample per
+        # category; more points would only overplot)
+        rng = np.random.default_rng(0)
+        for category, idx in islice(self.cat_idx.items(), 5):
+            if len(idx) > MAX_SCATTER:
+                idx = rng.choice(idx, MAX_SCATTER, replace=False)
+            ax_main.scatter(self.lon[idx], self.lat[idx],
+                          label=category, s=20, alpha=0.6, edgecolors='black', linewidth=0.5,
+                          rasterized=True)
         
         ax_main.set_xlim(-180, 180)
         ax_main.set_ylim(-90, 90)
@@ -929,7 +1015,8 @@ class UltimateGeoVisualizer:
         ax_stats1.set_facecolor('#f0f0f0')
         
         ax_stats2 = fig.add_subplot(gs[1, 2])
-        years_span = self.df['year'].max() - self.df['year'].min() + 1
+        years = self._yearly_counts.index
+        years_span = years[-1] - years[0] + 1
         ax_stats2.text(0.5, 0.7, f"{years_span}", ha='center', va='center',
                       fontsize=60, fontweight='bold', color='darkgreen')
         ax_stats2.text(0.5, 0.3, "YEARS COVERED", ha='center', va='center',
@@ -938,7 +1025,7 @@ class UltimateGeoVisualizer:
         ax_stats2.set_facecolor('#f0f0f0')
         
         plt.savefig(f'{self.output_dir}/publication_ready/infographic_map.png',
-                   dpi=300, bbox_inches='tight', facecolor='white')
+                   dpi=DPI, bbox_inches='tight', facecolor='white', pil_kwargs=PNG_KW)
         plt.close()
         print("    ✓ Saved: infographic_map.png (HIGH RESOLUTION)")
     
@@ -1001,8 +1088,7 @@ if __name__ == "__main__":
     try:
         # Load data
         print("📂 Loading data...")
-        df = pd.read_csv('eonet_cleaned.csv')
-        df['datetime'] = pd.to_datetime(df['datetime'])
+        df = load_cleaned()
         
         print(f"✓ Loaded {len(df):,} events successfully!\n")
         
@@ -1018,7 +1104,7 @@ if __name__ == "__main__":
         print("\n" + "🎉"*40 + "\n")
         
     except FileNotFoundError:
-        print("\n❌ ERROR: eonet_cleaned.csv not found!")
+        print("\n❌ ERROR: eonet_cleaned.parquet / eonet_cleaned.csv not found!")
         print("Please run 01_data_loading.py first.\n")
     except Exception as e:
         print(f"\n❌ ERROR: {e}\n")
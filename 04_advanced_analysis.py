@@ -4,14 +4,27 @@ NASA EONET Natural Events - Advanced Spatial Analysis
 
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import seaborn as sns
-from sklearn.cluster import DBSCAN
-from sklearn.preprocessing import StandardScaler
+from scipy.spatial import cKDTree
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
 import os
+from concurrent.futures import ProcessPoolExecutor
+from eonet_common import load_cleaned, worker_count, pool_context
 import warnings
 warnings.filterwarnings('ignore')
 
+# 200 DPI with light PNG compression saves far faster than 300 DPI at level 6;
+# set EONET_DPI=300 for print output
+DPI = int(os.environ.get('EONET_DPI', 200))
+PNG_KW = {'compress_level': 3}
+
+# Points per scatter; past a few thousand the cloud looks the same
+MAX_SCATTER = 5000
+
 def detect_hotspots(df):
     """Detect geographic hotspots"""
     print("Detecting hotspots...")
@@ -28,7 +41,10 @@ def detect_hotspots(df):
     axes[0].grid(True, alpha=0.3)
     
     # Wildfire hotspots
-    wildfires = df[df['category_title'].str.contains('Wildfire', na=False)]
+    # Match on the few category labels, then select rows by their codes
+    cat = df['category_title'].cat
+    fire_codes = np.flatnonzero(cat.categories.str.contains('Wildfire', regex=False))
+    wildfires = df[np.isin(cat.codes.to_numpy(), fire_codes)]
     if len(wildfires) > 0:
         hexbin2 = axes[1].hexbin(wildfires['longitude'], wildfires['latitude'],
                                  gridsize=30, cmap='Reds', mincnt=1)
@@ -39,35 +55,67 @@ def detect_hotspots(df):
         axes[1].grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig('advanced_analysis/hotspot_analysis.png', dpi=300, bbox_inches='tight')
+    plt.savefig('advanced_analysis/hotspot_analysis.png', dpi=DPI, bbox_inches='tight', pil_kwargs=PNG_KW)
     plt.close()
     print("  ✓ Saved: hotspot_analysis.png")
 
+def _dbscan_labels(coords, eps, min_samples):
+    """DBSCAN labels from a KD-tree pair query and connected components (-1 = noise)"""
+    n = len(coords)
+    pairs = cKDTree(coords).query_pairs(r=eps, output_type='ndarray')
+    i, j = pairs[:, 0], pairs[:, 1]
+    # Core points have min_samples neighbours within eps, counting themselves
+    core = np.bincount(pairs.ravel(), minlength=n) + 1 >= min_samples
+    
+    # Clusters are the connected groups of core points
+    both = core[i] & core[j]
+    graph = coo_matrix((np.ones(both.sum(), dtype=np.int8), (i[both], j[both])), shape=(n, n))
+    _, comp = connected_components(graph, directed=False)
+    labels = np.full(n, -1, dtype=np.intp)
+    # Number clusters by their first core point, as sklearn does
+    _, first, inverse = np.unique(comp[core], return_index=True, return_inverse=True)
+    rank = np.empty(len(first), dtype=np.intp)
+    rank[np.argsort(first)] = np.arange(len(first))
+    labels[core] = rank[inverse]
+    
+    # Border points join the cluster of a core neighbour
+    for a, b in ((i, j), (j, i)):
+        border = core[a] & ~core[b]
+        labels[b[border]] = labels[a[border]]
+    return labels
+
 def spatial_clustering(df):
     """Perform DBSCAN clustering"""
     print("Performing spatial clustering...")
     
-    # Prepare coordinates
-    coords = df[['latitude', 'longitude']].values
-    scaler = StandardScaler()
-    coords_scaled = scaler.fit_transform(coords)
+    # Standardize coordinates in place on one float64 buffer (same scaling as
+    # StandardScaler, so eps keeps its meaning)
+    coords_scaled = df[['latitude', 'longitude']].to_numpy(dtype=np.float64, copy=True)
+    std = coords_scaled.std(axis=0)
+    std[std == 0] = 1.0
+    coords_scaled -= coords_scaled.mean(axis=0)
+    coords_scaled /= std
     
-    # DBSCAN clustering
-    db = DBSCAN(eps=0.5, min_samples=10).fit(coords_scaled)
-    df['cluster'] = db.labels_
+    # DBSCAN clustering (eps=0.5, min_samples=10) on a KD-tree pair query
+    labels = _dbscan_labels(coords_scaled, eps=0.5, min_samples=10)
+    df['cluster'] = labels
     
-    n_clusters = len(set(db.labels_)) - (1 if -1 in db.labels_ else 0)
-    n_noise = list(db.labels_).count(-1)
+    n_clusters = int(labels.max()) + 1
+    n_noise = int((labels == -1).sum())
     
     print(f"  Found {n_clusters} clusters, {n_noise} noise points")
     
     # Visualize
     fig, ax = plt.subplots(figsize=(18, 10))
     
-    unique_labels = set(db.labels_)
+    # Row positions per label from one sort instead of a mask per cluster
+    unique_labels, sizes = np.unique(labels, return_counts=True)
+    members = np.split(np.argsort(labels, kind='stable'), np.cumsum(sizes)[:-1])
+    lon = df['longitude'].to_numpy()
+    lat = df['latitude'].to_numpy()
     colors = plt.cm.Spectral(np.linspace(0, 1, len(unique_labels)))
     
-    for label, color in zip(unique_labels, colors):
+    for label, rows, color in zip(unique_labels, members, colors):
         if label == -1:
             color = 'grey'
             marker = '.'
@@ -78,10 +126,9 @@ def spatial_clustering(df):
             size = 50
             alpha = 0.7
         
-        cluster_data = df[df['cluster'] == label]
-        ax.scatter(cluster_data['longitude'], cluster_data['latitude'],
+        ax.scatter(lon[rows], lat[rows],
                   c=[color], marker=marker, s=size, alpha=alpha,
-                  edgecolors='black', linewidths=0.5,
+                  edgecolors='black', linewidths=0.5, rasterized=True,
                   label=f'Cluster {label}' if label != -1 else 'Noise')
     
     ax.set_xlabel('Longitude', fontsize=12)
@@ -94,7 +141,7 @@ def spatial_clustering(df):
     ax.legend(handles[:11], labels[:11], loc='best', fontsize=8, ncol=2)
     
     plt.tight_layout()
-    plt.savefig('advanced_analysis/spatial_clusters.png', dpi=300, bbox_inches='tight')
+    plt.savefig('advanced_analysis/spatial_clusters.png', dpi=DPI, bbox_inches='tight', pil_kwargs=PNG_KW)
     plt.close()
     print("  ✓ Saved: spatial_clusters.png")
 
@@ -102,16 +149,19 @@ def temporal_spatial_patterns(df):
     """Analyze temporal-spatial patterns"""
     print("Analyzing temporal-spatial patterns...")
     
-    # Create latitude bands
-    df['lat_band'] = pd.cut(df['latitude'], 
-                            bins=[-90, -60, -30, 0, 30, 60, 90],
-                            labels=['Far South', 'South', 'Eq. South', 
-                                   'Eq. North', 'North', 'Far North'])
+    # Latitude bands as an int8-coded Categorical; (a, b] bins like pd.cut,
+    # values outside (-90, 90] become NaN
+    edges = np.array([-90, -60, -30, 0, 30, 60, 90], dtype=df['latitude'].dtype)
+    codes = np.searchsorted(edges, df['latitude'].to_numpy(), side='left').astype(np.int8) - 1
+    codes[codes >= len(edges) - 1] = -1
+    df['lat_band'] = pd.Categorical.from_codes(
+        codes, dtype=pd.CategoricalDtype(['Far South', 'South', 'Eq. South',
+                                          'Eq. North', 'North', 'Far North'], ordered=True))
     
     fig, axes = plt.subplots(2, 1, figsize=(16, 10))
     
     # Events by latitude band over time
-    pivot = pd.crosstab(df['year'], df['lat_band'])
+    pivot = df.groupby(['year', 'lat_band'], observed=True).size().unstack('lat_band', fill_value=0)
     pivot.plot(ax=axes[0], marker='o')
     axes[0].set_title('Events by Latitude Band Over Time', fontsize=14, fontweight='bold')
     axes[0].set_xlabel('Year')
@@ -120,14 +170,14 @@ def temporal_spatial_patterns(df):
     axes[0].grid(True, alpha=0.3)
     
     # Heatmap: year vs month
-    pivot2 = pd.crosstab(df['year'], df['month'])
+    pivot2 = df.groupby(['year', 'month']).size().unstack('month', fill_value=0)
     sns.heatmap(pivot2, cmap='YlOrRd', ax=axes[1], cbar_kws={'label': 'Events'})
     axes[1].set_title('Events by Year and Month', fontsize=14, fontweight='bold')
     axes[1].set_xlabel('Month')
     axes[1].set_ylabel('Year')
     
     plt.tight_layout()
-    plt.savefig('advanced_analysis/temporal_spatial_patterns.png', dpi=300, bbox_inches='tight')
+    plt.savefig('advanced_analysis/temporal_spatial_patterns.png', dpi=DPI, bbox_inches='tight', pil_kwargs=PNG_KW)
     plt.close()
     print("  ✓ Saved: temporal_spatial_patterns.png")
 
@@ -135,17 +185,20 @@ def regional_analysis(df):
     """Analyze by region"""
     print("Performing regional analysis...")
     
-    def assign_region(row):
-        lat, lon = row['latitude'], row['longitude']
-        if -170 < lon < -50:
-            return 'Americas' if lat > 0 else 'South America'
-        elif -20 < lon < 60:
-            return 'Europe' if lat > 35 else 'Africa'
-        elif 60 < lon < 150:
-            return 'Asia' if lat > 0 else 'Oceania'
-        return 'Other'
+    # Longitude bands split by latitude (first matching band wins)
+    lat = df['latitude'].to_numpy()
+    lon = df['longitude'].to_numpy()
+    americas = (lon > -170) & (lon < -50)
+    eur_afr = (lon > -20) & (lon < 60)
+    asia_oce = (lon > 60) & (lon < 150)
     
-    df['region'] = df.apply(assign_region, axis=1)
+    df['region'] = pd.Categorical(np.select(
+        [americas & (lat > 0), americas,
+         eur_afr & (lat > 35), eur_afr,
+         asia_oce & (lat > 0), asia_oce],
+        ['Americas', 'South America', 'Europe', 'Africa', 'Asia', 'Oceania'],
+        default='Other'
+    ))
     
     fig, axes = plt.subplots(1, 2, figsize=(16, 6))
     
@@ -158,11 +211,10 @@ def regional_analysis(df):
     axes[0].set_title('Events by Region', fontsize=14, fontweight='bold')
     axes[0].set_ylabel('Number of Events')
     
-    # Regional trends
+    # Regional trends (year x region counts in one pass)
+    trends = df.groupby(['year', 'region'], observed=True).size().unstack('region', fill_value=0)
     for region in region_counts.head(5).index:
-        region_data = df[df['region'] == region]
-        yearly = region_data.groupby('year').size()
-        axes[1].plot(yearly.index, yearly.values, marker='o', label=region, linewidth=2)
+        axes[1].plot(trends.index, trends[region].values, marker='o', label=region, linewidth=2)
     
     axes[1].set_title('Regional Trends Over Time', fontsize=14, fontweight='bold')
     axes[1].set_xlabel('Year')
@@ -171,7 +223,7 @@ def regional_analysis(df):
     axes[1].grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig('advanced_analysis/regional_analysis.png', dpi=300, bbox_inches='tight')
+    plt.savefig('advanced_analysis/regional_analysis.png', dpi=DPI, bbox_inches='tight', pil_kwargs=PNG_KW)
     plt.close()
     print("  ✓ Saved: regional_analysis.png")
 
@@ -185,8 +237,10 @@ def category_concentration(df):
     
     for idx, cat in enumerate(top_cats):
         cat_data = df[df['category_title'] == cat]
-        axes[idx].scatter(cat_data['longitude'], cat_data['latitude'],
-                         alpha=0.5, s=20, c='red', edgecolors='black', linewidths=0.5)
+        shown = cat_data.sample(MAX_SCATTER, random_state=0) if len(cat_data) > MAX_SCATTER else cat_data
+        axes[idx].scatter(shown['longitude'], shown['latitude'],
+                         alpha=0.5, s=20, c='red', edgecolors='black', linewidths=0.5,
+                         rasterized=True)
         axes[idx].set_xlabel('Longitude')
         axes[idx].set_ylabel('Latitude')
         axes[idx].set_title(f'{cat}\n({len(cat_data)} events)', fontweight='bold')
@@ -195,30 +249,52 @@ def category_concentration(df):
         axes[idx].set_ylim(-90, 90)
     
     plt.tight_layout()
-    plt.savefig('advanced_analysis/category_concentration.png', dpi=300, bbox_inches='tight')
+    plt.savefig('advanced_analysis/category_concentration.png', dpi=DPI, bbox_inches='tight', pil_kwargs=PNG_KW)
     plt.close()
     print("  ✓ Saved: category_concentration.png")
 
+ANALYSES = [detect_hotspots, spatial_clustering, temporal_spatial_patterns,
+            regional_analysis, category_concentration]
+
+# DataFrame shared with pool workers (sent once per worker by the initializer)
+_DF = None
+
+def _init_worker(df):
+    """Keep the DataFrame for every analysis this worker runs"""
+    global _DF
+    _DF = df
+
+def _run_analysis(func):
+    """Run one analysis on the worker's DataFrame"""
+    func(_DF)
+
 if __name__ == "__main__":
     print("\nNASA EONET - ADVANCED ANALYSIS\n")
     print("="*70)
     
     try:
-        # Load data
-        df = pd.read_csv('eonet_cleaned.csv')
-        df['datetime'] = pd.to_datetime(df['datetime'])
+        # Load data in compact dtypes; an up-to-date Parquet copy from 01 skips CSV and date parsing.
+        # year/month are nullable: undated events still count in the spatial analyses
+        dtypes = {'latitude': 'float32', 'longitude': 'float32',
+                  'year': 'Int16', 'month': 'Int8',
+                  'category_title': 'category', 'category_simple': 'category'}
+        df = load_cleaned(dtypes=dtypes)
         
         print(f"Loaded {len(df)} events\n")
         
         # Create output directory
         os.makedirs('advanced_analysis', exist_ok=True)
         
-        # Run all analyses
-        detect_hotspots(df)
-        spatial_clustering(df)
-        temporal_spatial_patterns(df)
-        regional_analysis(df)
-        category_concentration(df)
+        # The analyses are independent (each writes its own PNG), so they can run
+        # in parallel when given a worker budget (EONET_WORKERS); sequential by default
+        workers = min(len(ANALYSES), worker_count())
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=pool_context(),
+                                     initializer=_init_worker, initargs=(df,)) as pool:
+                list(pool.map(_run_analysis, ANALYSES))
+        else:
+            for analysis in ANALYSES:
+                analysis(df)
         
         print("\n" + "="*70)
         print("✓ SUCCESS! All analyses saved to: advanced_analysis/")
@@ -232,7 +308,7 @@ if __name__ == "__main__":
         print("\n🎉 COMPLETE ANALYSIS FINISHED!")
         
     except FileNotFoundError:
-        print("\nERROR: eonet_cleaned.csv not found!")
+        print("\nERROR: eonet_cleaned.parquet / eonet_cleaned.csv not found!")
         print("Run 01_data_loading.py first.")
     except Exception as e:
         print(f"\nERROR: {e}")
\ No newline at end of file
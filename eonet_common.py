@@ -0,0 +1,105 @@
+"""
+Helpers shared by the analysis scripts
+"""
+
+import os
+import multiprocessing as mp
+import numpy as np
+import pandas as pd
+from scipy.fft import rfft2, irfft2, next_fast_len
+
+# Cleaned data written by 01_data_loading.py (both files, together)
+CSV_PATH = 'eonet_cleaned.csv'
+PARQUET_PATH = 'eonet_cleaned.parquet'
+
+def parquet_is_fresh(csv_path=CSV_PATH, parquet_path=PARQUET_PATH):
+    """True if the Parquet copy exists and is at least as new as the CSV"""
+    return os.path.exists(parquet_path) and (not os.path.exists(csv_path) or
+                                             os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path))
+
+def load_cleaned(columns=None, dtypes=None, csv_path=CSV_PATH, parquet_path=PARQUET_PATH):
+    """Load the cleaned events: the Parquet copy when it is up to date, otherwise the CSV"""
+    if parquet_is_fresh(csv_path, parquet_path):
+        df = pd.read_parquet(parquet_path, engine='pyarrow', columns=columns)
+    else:
+        dates = ['datetime'] if columns is None or 'datetime' in columns else None
+        df = pd.read_csv(csv_path, usecols=columns, parse_dates=dates)
+    return df.astype(dtypes) if dtypes else df
+
+def worker_count():
+    """Processes (or threads) this script may use: EONET_WORKERS, which run_analysis
+    sets by splitting the cores between concurrent steps; sequential when unset"""
+    return max(1, int(os.environ.get('EONET_WORKERS', 1)))
+
+def pool_context():
+    """Start method for process pools: never fork a parent that already runs
+    Arrow/BLAS threads, so forkserver where available, otherwise spawn"""
+    return mp.get_context('forkserver' if 'forkserver' in mp.get_all_start_methods() else 'spawn')
+
+def cell_ids(lon, lat):
+    """Row-major index of the 1° cell containing each point (lon 180 and lat 90
+    fall in the last column/row rather than wrapping or overflowing)"""
+    row = np.clip(np.floor(lat).astype(np.int32) + 90, 0, 179)
+    col = np.clip(np.floor(lon).astype(np.int32) + 180, 0, 359)
+    return row * 360 + col
+
+def _bin_index(v, edges):
+    """Uniform-bin index of each value, nudged to agree exactly with the edges"""
+    n = len(edges) - 1
+    idx = ((v - edges[0]) * (n / ((edges[-1] - edges[0]) or 1.0))).astype(np.int32)
+    # Right edge is inclusive, as in NumPy
+    np.clip(idx, 0, n - 1, out=idx)
+    # Values that rounded across an edge move one bin (np.histogram does the same)
+    idx -= v < edges[idx]
+    idx += (v >= edges[idx + 1]) & (idx != n - 1)
+    return idx
+
+def hist2d(x, y, bins, x_range, y_range, chunk=1 << 20):
+    """Uniform-bin 2D histogram via integer binning (float64 edges, as np.histogram2d)"""
+    nx, ny = bins
+    xedges = np.linspace(*np.float64(x_range), nx + 1)
+    yedges = np.linspace(*np.float64(y_range), ny + 1)
+    
+    # Accumulate in fixed-size chunks so temporaries stay small for large N
+    H = np.zeros(nx * ny, dtype=np.int64)
+    for start in range(0, len(x), chunk):
+        ix = _bin_index(x[start:start + chunk], xedges)
+        ix *= ny
+        ix += _bin_index(y[start:start + chunk], yedges)
+        H += np.bincount(ix, minlength=nx * ny)
+    return H.reshape(nx, ny), xedges, yedges
+
+def binned_kde(x, y, x_grid, y_grid, workers=1):
+    """Gaussian KDE (Scott bandwidth) on a regular grid via binning + FFT convolution"""
+    # Points only enter through the grid counts below; the bandwidth needs just
+    # the 2x2 sample covariance, computed without stacking a 2xN copy
+    n = len(x)
+    xc = x - x.mean(dtype=np.float64)
+    yc = y - y.mean(dtype=np.float64)
+    sxy = xc @ yc
+    cov = np.array([[xc @ xc, sxy], [sxy, yc @ yc]]) / (n - 1) * n ** (-2 / 6)
+    
+    # Bin points onto the grid (bins centred on the grid nodes)
+    dx = x_grid[1] - x_grid[0]
+    dy = y_grid[1] - y_grid[0]
+    counts = hist2d(x, y, (len(x_grid), len(y_grid)),
+                    (x_grid[0] - dx / 2, x_grid[-1] + dx / 2),
+                    (y_grid[0] - dy / 2, y_grid[-1] + dy / 2))[0].T
+    
+    # Kernel sampled at grid offsets out to 4 sigma
+    hx = min(int(np.ceil(4 * np.sqrt(cov[0, 0]) / dx)), len(x_grid) - 1)
+    hy = min(int(np.ceil(4 * np.sqrt(cov[1, 1]) / dy)), len(y_grid) - 1)
+    # (quadratic form broadcast from the 1D offsets, no meshgrid temporaries)
+    kx = np.arange(-hx, hx + 1)[None, :] * dx
+    ky = np.arange(-hy, hy + 1)[:, None] * dy
+    inv = np.linalg.inv(cov)
+    q = inv[0, 0] * kx * kx + 2 * inv[0, 1] * kx * ky + inv[1, 1] * ky * ky
+    kernel = np.exp(-0.5 * q)
+    kernel /= 2 * np.pi * np.sqrt(np.linalg.det(cov))
+    
+    # 'same'-mode convolution with real FFTs padded to fast sizes, on `workers` threads
+    shape = [next_fast_len(counts.shape[i] + kernel.shape[i] - 1, real=True) for i in range(2)]
+    density = irfft2(rfft2(counts, shape, workers=workers) * rfft2(kernel, shape, workers=workers),
+                     shape, workers=workers)[hy:hy + len(y_grid), hx:hx + len(x_grid)]
+    
+    return np.clip(density, 0, None) / n
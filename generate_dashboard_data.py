@@ -5,17 +5,40 @@ Run this in global-natural-disasters/ directory
 
 import pandas as pd
 import numpy as np
-import json
+import orjson
+import os
 from datetime import datetime
+from eonet_common import CSV_PATH, PARQUET_PATH, parquet_is_fresh, load_cleaned
+
+def _top_k(values, k):
+    """Positions of the k largest values, descending (ties keep row order)"""
+    if len(values) > k:
+        # Everything above the k-th value, then ties at the cut in row order
+        kth = values[np.argpartition(values, len(values) - k)[len(values) - k]]
+        above = np.flatnonzero(values > kth)
+        tied = np.flatnonzero(values == kth)[:k - len(above)]
+        idx = np.concatenate([above, tied])
+    else:
+        idx = np.arange(len(values))
+    return idx[np.argsort(-values[idx], kind='stable')]
 
 print("="*70)
 print("GENERATING DASHBOARD DATA FROM YOUR ANALYSIS")
 print("="*70)
 
 # Load your actual data
-print("\n📊 Loading eonet_cleaned.csv...")
-df = pd.read_csv('eonet_cleaned.csv')
-df['datetime'] = pd.to_datetime(df['datetime'])
+# Compact dtypes; coordinates stay float64 because they are written to the
+# JSON as-is. Prefer an up-to-date Parquet copy from 01 (no CSV or date parsing)
+dtypes = {'year': 'int16', 'month': 'int8',
+          'category_title': 'category', 'category_simple': 'category'}
+print(f"\n📊 Loading {PARQUET_PATH if parquet_is_fresh() else CSV_PATH}...")
+df = load_cleaned(dtypes=dtypes)
+
+# float32 coordinates (00's schema) are widened through their shortest decimal
+# form, so the JSON gets 1.804 rather than 1.8040000200271606
+for col in ('latitude', 'longitude'):
+    if df[col].dtype != np.float64:
+        df[col] = df[col].astype(str).astype(np.float64)
 
 print(f"✅ Loaded {len(df):,} observations")
 
@@ -43,41 +66,42 @@ print(f"  • Unique events: {executive_metrics['unique_events']:,}")
 # ============================================================================
 print("\n🗺️  Detecting geographic hotspots...")
 
-# Create geographic bins (5-degree grid)
-df['lat_bin'] = (df['latitude'] / 5).round() * 5
-df['lon_bin'] = (df['longitude'] / 5).round() * 5
-
-# Group by bins and count events
-hotspots_df = df.groupby(['lat_bin', 'lon_bin']).agg({
-    'id': 'count',
-    'category_title': lambda x: x.mode()[0] if len(x) > 0 else 'Mixed'
-}).reset_index()
-
-hotspots_df.columns = ['latitude', 'longitude', 'count', 'primary_category']
-hotspots_df = hotspots_df.nlargest(30, 'count')
-
-# Add descriptive titles based on location
-def get_region_name(lat, lon):
-    if 10 <= lat <= 25 and -110 <= lon <= -85:
-        return "Hurricane Activity Zone"
-    elif 35 <= lat <= 45 and -125 <= lon <= -110:
-        return "California Fire Zone"
-    elif 5 <= lat <= 20 and 120 <= lon <= 135:
-        return "Pacific Typhoon Belt"
-    elif lat > 60:
-        return "Arctic Region"
-    elif lat < -60:
-        return "Antarctic Region"
-    elif -30 <= lat <= 0 and 110 <= lon <= 155:
-        return "Australian Zone"
-    elif -20 <= lat <= 10 and 165 <= lon <= -160:
-        return "Pacific Ring of Fire"
-    else:
-        return f"Region {lat:.0f}°, {lon:.0f}°"
+# Create geographic bins (5-degree grid, nearest multiple of 5 as integers)
+binned = df.assign(
+    lat_bin=np.rint(df['latitude'].to_numpy() / 5).astype(np.int16) * 5,
+    lon_bin=np.rint(df['longitude'].to_numpy() / 5).astype(np.int16) * 5
+)
 
-hotspots_df['title'] = hotspots_df.apply(
-    lambda row: get_region_name(row['latitude'], row['longitude']), 
-    axis=1
+# Events per bin and category in one pass; the primary category is the
+# most frequent one in each bin (ties go to the first name, like mode())
+cell_counts = (binned.groupby(['lat_bin', 'lon_bin', 'category_title'], observed=True)
+                     .size().reset_index(name='n'))
+per_bin = cell_counts.groupby(['lat_bin', 'lon_bin'])['n']
+top = cell_counts.loc[per_bin.idxmax()]
+hotspots_df = pd.DataFrame({
+    'latitude': top['lat_bin'].to_numpy(),
+    'longitude': top['lon_bin'].to_numpy(),
+    'count': per_bin.sum().to_numpy(),
+    'primary_category': top['category_title'].to_numpy()
+})
+hotspots_df = hotspots_df.iloc[_top_k(hotspots_df['count'].to_numpy(), 30)]
+
+# Add descriptive titles based on location (first matching zone wins)
+lat = hotspots_df['latitude'].to_numpy()
+lon = hotspots_df['longitude'].to_numpy()
+zones = [
+    ((lat >= 10) & (lat <= 25) & (lon >= -110) & (lon <= -85), "Hurricane Activity Zone"),
+    ((lat >= 35) & (lat <= 45) & (lon >= -125) & (lon <= -110), "California Fire Zone"),
+    ((lat >= 5) & (lat <= 20) & (lon >= 120) & (lon <= 135), "Pacific Typhoon Belt"),
+    (lat > 60, "Arctic Region"),
+    (lat < -60, "Antarctic Region"),
+    ((lat >= -30) & (lat <= 0) & (lon >= 110) & (lon <= 155), "Australian Zone"),
+    ((lat >= -20) & (lat <= 10) & (lon >= 165) & (lon <= -160), "Pacific Ring of Fire")
+]
+hotspots_df['title'] = np.select(
+    [mask for mask, _ in zones],
+    [name for _, name in zones],
+    default=[f"Region {la:.0f}°, {lo:.0f}°" for la, lo in zip(lat, lon)]
 )
 
 hotspots = hotspots_df.to_dict('records')
@@ -89,19 +113,22 @@ print(f"  • Top hotspot: {hotspots[0]['count']} events at ({hotspots[0]['latit
 # ============================================================================
 print("\n📅 Analyzing seasonal patterns...")
 
+# Month x category counts in one pass (all 12 months, missing ones as zeros)
+by_month = (df.groupby(['month', 'category_simple'], observed=True).size()
+              .unstack('category_simple', fill_value=0)
+              .reindex(range(1, 13), fill_value=0))
+
 seasonal_data = []
-for month in range(1, 13):
-    month_df = df[df['month'] == month]
-    
+for month, counts in zip(range(1, 13), by_month.to_dict('records')):
     seasonal_data.append({
         'month': month,
         'month_name': datetime(2000, month, 1).strftime('%b'),
-        'total_events': len(month_df),
-        'storms': len(month_df[month_df['category_simple'] == 'Storm']),
-        'wildfires': len(month_df[month_df['category_simple'] == 'Wildfire']),
-        'volcanoes': len(month_df[month_df['category_simple'] == 'Volcano']),
-        'floods': len(month_df[month_df['category_simple'] == 'Flood']),
-        'ice': len(month_df[month_df['category_simple'] == 'Ice'])
+        'total_events': sum(counts.values()),
+        'storms': counts.get('Storm', 0),
+        'wildfires': counts.get('Wildfire', 0),
+        'volcanoes': counts.get('Volcano', 0),
+        'floods': counts.get('Flood', 0),
+        'ice': counts.get('Ice', 0)
     })
 
 print(f"  • Peak month: {max(seasonal_data, key=lambda x: x['total_events'])['month_name']} with {max(seasonal_data, key=lambda x: x['total_events'])['total_events']:,} events")
@@ -117,7 +144,7 @@ total_obs = len(df)
 for category, count in df['category_title'].value_counts().items():
     category_distribution.append({
         'name': category,
-        'count': int(count),
+        'count': count,
         'percentage': round((count / total_obs) * 100, 1)
     })
 
@@ -126,16 +153,19 @@ for category, count in df['category_title'].value_counts().items():
 # ============================================================================
 print("\n📈 Analyzing yearly trends...")
 
+# Year x category counts in one pass; keep the last 10 years
+by_year = (df.groupby(['year', 'category_simple'], observed=True).size()
+             .unstack('category_simple', fill_value=0)
+             .tail(10))
+
 yearly_trends = []
-for year in sorted(df['year'].unique())[-10:]:  # Last 10 years
-    year_df = df[df['year'] == year]
-    
+for year, counts in zip(by_year.index, by_year.to_dict('records')):
     yearly_trends.append({
-        'year': int(year),
-        'total': len(year_df),
-        'storms': len(year_df[year_df['category_simple'] == 'Storm']),
-        'wildfires': len(year_df[year_df['category_simple'] == 'Wildfire']),
-        'volcanoes': len(year_df[year_df['category_simple'] == 'Volcano'])
+        'year': year,
+        'total': sum(counts.values()),
+        'storms': counts.get('Storm', 0),
+        'wildfires': counts.get('Wildfire', 0),
+        'volcanoes': counts.get('Volcano', 0)
     })
 
 # ============================================================================
@@ -143,7 +173,9 @@ for year in sorted(df['year'].unique())[-10:]:  # Last 10 years
 # ============================================================================
 print("\n🔴 Getting recent events...")
 
-recent_events = df.nlargest(100, 'datetime')[[
+# Select the 100 newest in O(N) on the int64 timestamps instead of a full sort
+recent_idx = _top_k(df['datetime'].to_numpy().view('i8'), 100)
+recent_events = df.iloc[recent_idx][[
     'id', 'title', 'category_title', 'latitude', 'longitude', 'date'
 ]].to_dict('records')
 
@@ -152,7 +184,6 @@ recent_events = df.nlargest(100, 'datetime')[[
 # ============================================================================
 print("\n🌍 Sampling events for interactive map...")
 
-sample_events = []
 categories_to_sample = {
     'Storm': 500,
     'Wildfire': 300,
@@ -161,21 +192,17 @@ categories_to_sample = {
     'Flood': 100
 }
 
+samples = []
 for category, sample_size in categories_to_sample.items():
     cat_df = df[df['category_simple'] == category]
     if len(cat_df) > sample_size:
-        sampled = cat_df.sample(sample_size)
-    else:
-        sampled = cat_df
-    
-    for _, row in sampled.iterrows():
-        sample_events.append({
-            'lat': float(row['latitude']),
-            'lon': float(row['longitude']),
-            'category': row['category_title'],
-            'title': row['title'],
-            'date': row['date']
-        })
+        cat_df = cat_df.sample(sample_size, random_state=0)
+    samples.append(cat_df)
+
+# One records conversion for the whole sample instead of a dict per iterrows() row
+sample_events = (pd.concat(samples)[['latitude', 'longitude', 'category_title', 'title', 'date']]
+                   .rename(columns={'latitude': 'lat', 'longitude': 'lon', 'category_title': 'category'})
+                   .to_dict('records'))
 
 print(f"  • Sampled {len(sample_events)} events for map")
 
@@ -184,26 +211,25 @@ print(f"  • Sampled {len(sample_events)} events for map")
 # ============================================================================
 print("\n🌏 Calculating regional statistics...")
 
-def get_region(lat, lon):
-    if -180 <= lon < -30:
-        return 'Americas'
-    elif -30 <= lon < 60:
-        return 'Europe/Africa'
-    elif 60 <= lon < 150:
-        return 'Asia/Pacific'
-    else:
-        return 'Other'
+# Longitude bands (first matching band wins)
+lon = df['longitude'].to_numpy()
+df['region'] = pd.Categorical(np.select(
+    [(lon >= -180) & (lon < -30), (lon >= -30) & (lon < 60), (lon >= 60) & (lon < 150)],
+    ['Americas', 'Europe/Africa', 'Asia/Pacific'],
+    default='Other'
+))
 
-df['region'] = df.apply(lambda row: get_region(row['latitude'], row['longitude']), axis=1)
+by_region = (df.groupby(['region', 'category_simple'], observed=True).size()
+               .unstack('category_simple', fill_value=0))
 
 regional_stats = []
 for region in df['region'].unique():
-    region_df = df[df['region'] == region]
+    counts = by_region.loc[region]
     regional_stats.append({
         'region': region,
-        'total_events': len(region_df),
-        'wildfires': len(region_df[region_df['category_simple'] == 'Wildfire']),
-        'storms': len(region_df[region_df['category_simple'] == 'Storm'])
+        'total_events': counts.sum(),
+        'wildfires': counts.get('Wildfire', 0),
+        'storms': counts.get('Storm', 0)
     })
 
 # ============================================================================
@@ -234,12 +260,12 @@ dashboard_data = {
 # ============================================================================
 print("\n💾 Saving to vercel_app/public/...")
 
-import os
 os.makedirs('vercel_app/public', exist_ok=True)
 
 output_file = 'vercel_app/public/analysis_data.json'
-with open(output_file, 'w') as f:
-    json.dump(dashboard_data, f, indent=2)
+# orjson serializes numpy scalars directly; compact output keeps the file small
+with open(output_file, 'wb') as f:
+    f.write(orjson.dumps(dashboard_data, option=orjson.OPT_SERIALIZE_NUMPY))
 
 print(f"✅ Saved to: {output_file}")
 
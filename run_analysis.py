@@ -1,45 +1,146 @@
 """
 NASA EONET Natural Events Analysis - Main Runner
-Execute all analysis scripts in sequence
+Execute all analysis scripts (independent ones concurrently)
 """
 
+import argparse
+import json
+import os
 import subprocess
 import sys
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 
-def run_script(script_name, description):
-    """Run a Python script and handle errors"""
+# Pipeline stages: 01 writes the cleaned data, 02-04 only read it and are
+# independent of each other, so each later stage runs its scripts side by side.
+# Each step is (script, description, inputs, outputs); a step whose outputs are
+# all newer than its inputs (and its own script) is skipped
+STAGES = [
+    [('01_data_loading.py', 'Data Loading and Cleaning',
+      ['eonet_data.parquet', 'eonet_data.csv'],
+      ['eonet_cleaned.csv', 'eonet_cleaned.parquet'])],
+    [('02_exploratory_analysis.py', 'Exploratory Data Analysis',
+      ['eonet_cleaned.parquet'],
+      ['analysis_outputs/temporal_analysis.png',
+       'analysis_outputs/category_analysis.png',
+       'analysis_outputs/geographic_distribution.png']),
+     ('03_geospatial_visualization.py', 'Geospatial Visualization',
+      ['eonet_cleaned.csv', 'eonet_cleaned.parquet', 'eonet_common.py'],
+      ['policy_visualizations/01_executive_dashboard.html',
+       'policy_visualizations/02_risk_hotspot_map.html',
+       'policy_visualizations/03_temporal_risk_analysis.html',
+       'policy_visualizations/04_3d_intelligence_globe.html',
+       'policy_visualizations/05_regional_impact_analysis.html',
+       'policy_visualizations/06_trend_forecasting.html',
+       'policy_visualizations/07_seasonal_risk_calendar.html',
+       'policy_visualizations/08_policy_report.png']),
+     ('04_advanced_analysis.py', 'Advanced Spatial Analysis',
+      ['eonet_cleaned.csv', 'eonet_cleaned.parquet', 'eonet_common.py'],
+      ['advanced_analysis/hotspot_analysis.png',
+       'advanced_analysis/spatial_clusters.png',
+       'advanced_analysis/temporal_spatial_patterns.png',
+       'advanced_analysis/regional_analysis.png',
+       'advanced_analysis/category_concentration.png'])]
+]
+
+# Last status and timing per script, so re-runs can resume
+MANIFEST_PATH = '.run_manifest.json'
+
+# Serializes output lines from concurrently running scripts
+_print_lock = threading.Lock()
+
+def load_manifest():
+    """Read the previous run's per-script status (empty if there is none)"""
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def save_manifest(manifest):
+    """Write the manifest atomically (write-then-rename)"""
+    with open(MANIFEST_PATH + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(MANIFEST_PATH + '.tmp', MANIFEST_PATH)
+
+def is_up_to_date(script, inputs, outputs):
+    """True if every output exists and is newer than the script and its existing inputs"""
+    if not all(os.path.exists(o) for o in outputs):
+        return False
+    sources = [script] + [i for i in inputs if os.path.exists(i)]
+    return min(os.path.getmtime(o) for o in outputs) >= max(os.path.getmtime(i) for i in sources)
+
+def print_header(title):
+    """Print a section banner"""
     print("\n" + "="*70)
-    print(f"RUNNING: {description}")
+    print(title)
     print("="*70)
+
+def run_script(script_name, tag='', workers=1):
+    """Run a Python script with a worker budget, streaming its output line by line as it arrives"""
+    if not os.path.exists(script_name):
+        print(f"\n{tag}✗ Script not found: {script_name}")
+        return False, 0.0
     
-    try:
-        start_time = time.time()
-        result = subprocess.run([sys.executable, script_name], 
-                              check=True, 
-                              capture_output=True, 
-                              text=True)
-        
-        print(result.stdout)
-        if result.stderr:
-            print("WARNINGS/ERRORS:")
-            print(result.stderr)
-        
-        elapsed = time.time() - start_time
-        print(f"\n✓ Completed in {elapsed:.2f} seconds")
-        return True
-        
-    except subprocess.CalledProcessError as e:
-        print(f"\n✗ Error running {script_name}:")
-        print(e.stdout)
-        print(e.stderr)
-        return False
-    except FileNotFoundError:
-        print(f"\n✗ Script not found: {script_name}")
-        return False
+    start_time = time.time()
+    # Unbuffered child stdout so progress shows up live; stderr folded into the
+    # same pipe, so nothing is held in memory beyond the current line.
+    # EONET_WORKERS caps the processes/threads the script itself starts
+    env = dict(os.environ, PYTHONUNBUFFERED='1', EONET_WORKERS=str(workers))
+    with subprocess.Popen([sys.executable, script_name],
+                          stdout=subprocess.PIPE,
+                          stderr=subprocess.STDOUT,
+                          text=True,
+                          bufsize=1,
+                          env=env) as proc:
+        for line in proc.stdout:
+            with _print_lock:
+                sys.stdout.write(tag + line)
+    
+    elapsed = time.time() - start_time
+    success = proc.returncode == 0
+    with _print_lock:
+        if success:
+            print(f"\n{tag}✓ Completed in {elapsed:.2f} seconds")
+        else:
+            print(f"\n{tag}✗ Error running {script_name} (exit code {proc.returncode})")
+    return success, elapsed
+
+def run_stage(steps, serial=False):
+    """Run one pipeline stage, yielding (script, success, elapsed) per script in step order"""
+    if not steps:
+        return
+    cores = os.cpu_count() or 1
+    if serial or len(steps) == 1:
+        for script, description in steps:
+            print_header(f"RUNNING: {description}")
+            yield (script, *run_script(script, workers=cores))
+        return
+    
+    # Concurrent scripts interleave, so each output line is tagged with its step number
+    tags = [f"[{script.split('_')[0]}] " for script, _ in steps]
+    print_header("RUNNING IN PARALLEL:\n" +
+                 "\n".join(f"  {tag}{description}" for tag, (_, description) in zip(tags, steps)))
+    # The cores are split between the concurrent scripts
+    workers = [max(1, cores // len(steps))] * len(steps)
+    with ThreadPoolExecutor(max_workers=len(steps)) as pool:
+        runs = list(pool.map(run_script, [script for script, _ in steps], tags, workers))
+    for (script, _), run in zip(steps, runs):
+        yield (script, *run)
 
 def main():
     """Main execution pipeline"""
+    parser = argparse.ArgumentParser(description='Run the complete EONET analysis pipeline')
+    parser.add_argument('--serial', action='store_true',
+                        help='run the analysis scripts one at a time')
+    parser.add_argument('--force', action='store_true',
+                        help='re-run every step, even if its outputs are up to date')
+    parser.add_argument('-y', '--yes', action='store_true',
+                        help='start without the confirmation prompt (for CI and cron)')
+    args = parser.parse_args()
+    
     print("\n" + "="*70)
     print("NASA EONET NATURAL EVENTS - COMPLETE ANALYSIS PIPELINE")
     print("="*70)
@@ -48,30 +149,42 @@ def main():
     print("  2. Perform exploratory data analysis")
     print("  3. Create geospatial visualizations")
     print("  4. Run advanced spatial analysis")
-    print("\nNote: Make sure 'eonet_data.csv' is in the current directory")
+    print("\nNote: Make sure 'eonet_data.parquet' (or 'eonet_data.csv') from")
+    print("      00_fetch_data_from_api.py is in the current directory")
     print("="*70)
     
-    input("\nPress Enter to start the analysis pipeline...")
-    
-    # Pipeline steps
-    steps = [
-        ('01_data_loading.py', 'Data Loading and Cleaning'),
-        ('02_exploratory_analysis.py', 'Exploratory Data Analysis'),
-        ('03_geospatial_visualization.py', 'Geospatial Visualization'),
-        ('04_advanced_analysis.py', 'Advanced Spatial Analysis')
-    ]
+    # Only prompt when someone is at the terminal; a headless run would block forever
+    if not (args.yes or os.environ.get('EONET_NONINTERACTIVE') == '1' or not sys.stdin.isatty()):
+        input("\nPress Enter to start the analysis pipeline...")
     
-    results = []
+    manifest = load_manifest()
     total_start = time.time()
     
-    for script, description in steps:
-        success = run_script(script, description)
-        results.append((description, success))
+    for stage in STAGES:
+        pending = []
+        for script, description, inputs, outputs in stage:
+            # Skip steps that succeeded last time and whose outputs are still current
+            last_status = manifest.get(script, {}).get('status')
+            if (not args.force and last_status in ('success', 'up to date')
+                    and is_up_to_date(script, inputs, outputs)):
+                print(f"\n✓ Up to date, skipping: {description}")
+                manifest[script]['status'] = 'up to date'
+            else:
+                pending.append((script, description))
         
-        if not success:
-            print("\n⚠ WARNING: Script failed. Continuing with next step...")
-        
-        time.sleep(1)  # Brief pause between scripts
+        for script, success, elapsed in run_stage(pending, serial=args.serial):
+            manifest[script] = {
+                'status': 'success' if success else 'failed',
+                'elapsed': round(elapsed, 2),
+                'finished_at': datetime.now().isoformat(timespec='seconds')
+            }
+            # Saved after every script so an interrupted run keeps its progress
+            save_manifest(manifest)
+            
+            if not success:
+                print("\n⚠ WARNING: Script failed. Continuing with next step...")
+    
+    save_manifest(manifest)
     
     # Final summary
     total_time = time.time() - total_start
@@ -80,20 +193,23 @@ def main():
     print("PIPELINE EXECUTION SUMMARY")
     print("="*70)
     
-    for description, success in results:
-        status = "✓ SUCCESS" if success else "✗ FAILED"
-        print(f"{status}: {description}")
+    labels = {'success': "✓ SUCCESS", 'up to date': "✓ UP TO DATE", 'failed': "✗ FAILED"}
+    steps = [(script, description) for stage in STAGES for script, description, _, _ in stage]
+    for script, description in steps:
+        entry = manifest.get(script, {})
+        timing = f" ({entry['elapsed']:.2f}s, {entry['finished_at']})" if 'elapsed' in entry else ""
+        print(f"{labels[entry.get('status', 'failed')]}: {description}{timing}")
     
     print(f"\nTotal execution time: {total_time:.2f} seconds")
     
-    successful = sum(1 for _, success in results if success)
+    successful = sum(1 for script, _ in steps if manifest.get(script, {}).get('status') != 'failed')
     print(f"\nCompleted {successful}/{len(steps)} steps successfully")
     
     if successful == len(steps):
         print("\n🎉 All analyses completed successfully!")
         print("\nOutput directories:")
         print("  • analysis_outputs/ - EDA visualizations")
-        print("  • geospatial_outputs/ - Interactive maps and visualizations")
+        print("  • policy_visualizations/ - Interactive maps and policy report")
         print("  • advanced_analysis/ - Advanced spatial analysis results")
         print("\nOpen the HTML files in your browser for interactive exploration!")
     else:
@@ -5,18 +5,38 @@ Copies PNG images and creates JSON manifest
 
 import pandas as pd
 import numpy as np
-import json
+import orjson
 import os
 import shutil
+from fnmatch import fnmatch
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from eonet_common import load_cleaned
+
+def needs_copy(src, dst):
+    """True unless dst already has src's size and is at least as new (rsync-style check)"""
+    try:
+        s_dst = os.stat(dst)
+    except FileNotFoundError:
+        return True
+    s_src = os.stat(src)
+    return s_dst.st_size != s_src.st_size or s_dst.st_mtime < s_src.st_mtime
 
 print("="*70)
 print("GENERATING COMPLETE DASHBOARD DATA")
 print("="*70)
 
-# Load data
-df = pd.read_csv('eonet_cleaned.csv')
-df['datetime'] = pd.to_datetime(df['datetime'])
+# Only the columns this script uses, in narrow dtypes (coordinates are only binned)
+COLUMNS = ['datetime', 'latitude', 'longitude', 'id', 'category_title',
+           'category_simple', 'month', 'year']
+DTYPES = {'latitude': 'float32', 'longitude': 'float32', 'id': 'string',
+          'category_title': 'category', 'category_simple': 'category',
+          'month': 'int8', 'year': 'int16'}
+
+# Load data: the Parquet copy from 01 when it is at least as new as the CSV,
+# otherwise the CSV; low-cardinality labels become categoricals, so masks and
+# groupbys work on int codes
+df = load_cleaned(columns=COLUMNS, dtypes=DTYPES)
 
 # ============================================================================
 # 1. COPY ALL YOUR ANALYSIS OUTPUTS TO DASHBOARD
@@ -53,27 +73,50 @@ image_sources = {
 }
 
 copied_files = []
+copy_tasks = []
 
+# Collect every (source, destination) pair first, then copy them in one batch
 for source_dir, files in image_sources.items():
     if os.path.exists(source_dir):
         print(f"  Copying from {source_dir}/...")
         for file_pattern in files:
             if '*' in file_pattern:
-                # Handle wildcards
-                import glob
-                pattern = os.path.join(source_dir, file_pattern)
-                for file_path in glob.glob(pattern):
-                    dest = os.path.join('vercel_app/public/analysis_images', os.path.basename(file_path))
-                    shutil.copy2(file_path, dest)
-                    copied_files.append(os.path.basename(file_path))
+                # Handle wildcards with one scandir pass (DirEntry caches the
+                # file type, so no extra stat per candidate); hidden files are
+                # skipped as glob does
+                subdir, name_pattern = os.path.split(file_pattern)
+                scan_dir = os.path.join(source_dir, subdir)
+                if not os.path.isdir(scan_dir):
+                    continue
+                with os.scandir(scan_dir) as entries:
+                    for entry in entries:
+                        if (entry.name.startswith('.') or not entry.is_file()
+                                or not fnmatch(entry.name, name_pattern)):
+                            continue
+                        dest = os.path.join('vercel_app/public/analysis_images', entry.name)
+                        copy_tasks.append((entry.path, dest))
+                        copied_files.append(entry.name)
             else:
                 source = os.path.join(source_dir, file_pattern)
                 if os.path.exists(source):
                     dest = os.path.join('vercel_app/public/analysis_images', file_pattern)
-                    shutil.copy2(source, dest)
+                    copy_tasks.append((source, dest))
                     copied_files.append(file_pattern)
                     print(f"    ✓ {file_pattern}")
 
+# One copy per destination (a later source wins, as with sequential copies);
+# source inode order roughly follows on-disk layout, keeping reads sequential
+latest = {dest: source for source, dest in copy_tasks}
+# Files unchanged since the last run are skipped (copies keep the source mtime)
+copy_tasks = sorted(((source, dest) for dest, source in latest.items() if needs_copy(source, dest)),
+                    key=lambda task: os.stat(task[0]).st_ino)
+print(f"  Up to date: {len(latest) - len(copy_tasks)}, copying: {len(copy_tasks)}")
+# Copies block in syscalls (GIL released), so a few threads overlap their I/O;
+# set EONET_COPY_WORKERS=1 on spinning disks
+workers = int(os.environ.get('EONET_COPY_WORKERS', 8))
+with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+    list(pool.map(lambda task: shutil.copy2(*task), copy_tasks))
+
 print(f"  Total files copied: {len(copied_files)}")
 
 # ============================================================================
@@ -82,65 +125,79 @@ print(f"  Total files copied: {len(copied_files)}")
 print("\n📊 Generating statistical data...")
 
 # Hotspots
-df['lat_bin'] = (df['latitude'] / 5).round() * 5
-df['lon_bin'] = (df['longitude'] / 5).round() * 5
-
-hotspots_df = df.groupby(['lat_bin', 'lon_bin']).agg({
-    'id': 'count',
-    'category_title': lambda x: x.mode()[0] if len(x) > 0 else 'Mixed'
-}).reset_index()
-hotspots_df.columns = ['latitude', 'longitude', 'count', 'primary_category']
-hotspots_df = hotspots_df.nlargest(30, 'count')
-
-def get_region_name(lat, lon):
-    if 10 <= lat <= 25 and -110 <= lon <= -85:
-        return "Hurricane Activity Zone"
-    elif 35 <= lat <= 45 and -125 <= lon <= -110:
-        return "California Fire Zone"
-    elif 5 <= lat <= 20 and 120 <= lon <= 135:
-        return "Pacific Typhoon Belt"
-    elif lat > 60:
-        return "Arctic Region"
-    elif lat < -60:
-        return "Antarctic Region"
-    else:
-        return f"Region {lat:.0f}°, {lon:.0f}°"
-
-hotspots_df['title'] = hotspots_df.apply(
-    lambda row: get_region_name(row['latitude'], row['longitude']), axis=1
+# 5-degree grid: nearest multiple of 5 as int16 (one pass per column, compact group keys)
+df['lat_bin'] = np.rint(df['latitude'].to_numpy() / 5).astype(np.int16) * 5
+df['lon_bin'] = np.rint(df['longitude'].to_numpy() / 5).astype(np.int16) * 5
+
+# Events per bin and category in one pass (occupied combinations only); the
+# primary category is the most frequent one per bin, ties going to the first
+# name as mode() did. cell_counts is already in bin order, so the per-bin
+# groupby can skip its key sort
+cell_counts = (df.groupby(['lat_bin', 'lon_bin', 'category_title'], observed=True)
+                 .size().reset_index(name='n'))
+per_bin = cell_counts.groupby(['lat_bin', 'lon_bin'], sort=False)['n']
+top = cell_counts.loc[per_bin.idxmax()]
+hotspots_df = pd.DataFrame({
+    'latitude': top['lat_bin'].to_numpy(),
+    'longitude': top['lon_bin'].to_numpy(),
+    'count': per_bin.sum().to_numpy(),
+    'primary_category': top['category_title'].to_numpy()
+})
+# Narrow dtypes before the records conversion (coordinates are already int16)
+hotspots_df = hotspots_df.nlargest(30, 'count').astype({'count': np.int32})
+
+# Descriptive titles based on location (first matching zone wins)
+lat = hotspots_df['latitude'].to_numpy()
+lon = hotspots_df['longitude'].to_numpy()
+zones = [
+    ((lat >= 10) & (lat <= 25) & (lon >= -110) & (lon <= -85), "Hurricane Activity Zone"),
+    ((lat >= 35) & (lat <= 45) & (lon >= -125) & (lon <= -110), "California Fire Zone"),
+    ((lat >= 5) & (lat <= 20) & (lon >= 120) & (lon <= 135), "Pacific Typhoon Belt"),
+    (lat > 60, "Arctic Region"),
+    (lat < -60, "Antarctic Region")
+]
+hotspots_df['title'] = np.select(
+    [mask for mask, _ in zones],
+    [name for _, name in zones],
+    default=[f"Region {la:.0f}°, {lo:.0f}°" for la, lo in zip(lat, lon)]
 )
 
-# Seasonal data
+# Seasonal data: month x category counts in one pass (all 12 months, missing ones as zeros)
+by_month = (df.groupby(['month', 'category_simple'], observed=True).size()
+              .unstack('category_simple', fill_value=0)
+              .reindex(range(1, 13), fill_value=0))
+
 seasonal_data = []
-for month in range(1, 13):
-    month_df = df[df['month'] == month]
+for month, counts in zip(range(1, 13), by_month.to_dict('records')):
     seasonal_data.append({
         'month': month,
         'month_name': datetime(2000, month, 1).strftime('%b'),
-        'total_events': len(month_df),
-        'storms': len(month_df[month_df['category_simple'] == 'Storm']),
-        'wildfires': len(month_df[month_df['category_simple'] == 'Wildfire']),
+        'total_events': sum(counts.values()),
+        'storms': counts.get('Storm', 0),
+        'wildfires': counts.get('Wildfire', 0),
     })
 
-# Category distribution
-category_distribution = []
+# Category distribution (percentages in one vectorized pass)
 total_obs = len(df)
-for category, count in df['category_title'].value_counts().items():
-    category_distribution.append({
-        'name': category,
-        'count': int(count),
-        'percentage': round((count / total_obs) * 100, 1)
-    })
+cat_counts = df['category_title'].value_counts()
+cat_pct = (cat_counts / total_obs * 100).round(1)
+category_distribution = [
+    {'name': name, 'count': count, 'percentage': pct}
+    for name, count, pct in zip(cat_counts.index, cat_counts.to_numpy(), cat_pct.to_numpy())
+]
+
+# Yearly trends (last 10 years): year x category counts in one pass
+by_year = (df.groupby(['year', 'category_simple'], observed=True).size()
+             .unstack('category_simple', fill_value=0)
+             .tail(10))
 
-# Yearly trends (last 10 years)
 yearly_trends = []
-for year in sorted(df['year'].unique())[-10:]:
-    year_df = df[df['year'] == year]
+for year, counts in zip(by_year.index, by_year.to_dict('records')):
     yearly_trends.append({
-        'year': int(year),
-        'total': len(year_df),
-        'storms': len(year_df[year_df['category_simple'] == 'Storm']),
-        'wildfires': len(year_df[year_df['category_simple'] == 'Wildfire']),
+        'year': year,
+        'total': sum(counts.values()),
+        'storms': counts.get('Storm', 0),
+        'wildfires': counts.get('Wildfire', 0),
     })
 
 # ============================================================================
@@ -148,35 +205,40 @@ for year in sorted(df['year'].unique())[-10:]:
 # ============================================================================
 print("\n📋 Creating visualization manifest...")
 
-available_visualizations = {
-    'static_images': {},
-    'interactive_maps': {},
-    'html_dashboards': {}
-}
+# Partition by extension once; the summary below reuses these lists
+pngs = [f for f in copied_files if f.endswith('.png')]
+htmls = [f for f in copied_files if f.endswith('.html')]
+advanced_tokens = ('hotspot', 'cluster', 'temporal_spatial', 'regional', 'concentration')
 
-# Scan for what's available
-for filename in copied_files:
-    if filename.endswith('.png'):
-        category = 'advanced_analysis' if any(x in filename for x in ['hotspot', 'cluster', 'temporal_spatial', 'regional', 'concentration']) else 'basic_analysis'
-        available_visualizations['static_images'][filename] = {
-            'path': f'/analysis_images/{filename}',
-            'category': category,
-            'title': filename.replace('_', ' ').replace('.png', '').title()
+available_visualizations = {
+    'static_images': {
+        f: {
+            'path': f'/analysis_images/{f}',
+            'category': 'advanced_analysis' if any(t in f for t in advanced_tokens) else 'basic_analysis',
+            'title': f.replace('_', ' ').replace('.png', '').title()
         }
-    elif filename.endswith('.html'):
-        available_visualizations['interactive_maps'][filename] = {
-            'path': f'/analysis_images/{filename}',
-            'title': filename.replace('_', ' ').replace('.html', '').title()
+        for f in pngs
+    },
+    'interactive_maps': {
+        f: {
+            'path': f'/analysis_images/{f}',
+            'title': f.replace('_', ' ').replace('.html', '').title()
         }
+        for f in htmls
+    },
+    'html_dashboards': {}
+}
 
 # ============================================================================
 # 4. PACKAGE EVERYTHING
 # ============================================================================
+unique_events = df['id'].nunique()
+
 dashboard_data = {
     'generated_at': datetime.now().isoformat(),
     'metadata': {
-        'total_observations': len(df),
-        'unique_events': df['id'].nunique(),
+        'total_observations': total_obs,
+        'unique_events': unique_events,
         'date_range': {
             'start': df['datetime'].min().strftime('%Y-%m-%d'),
             'end': df['datetime'].max().strftime('%Y-%m-%d')
@@ -184,9 +246,9 @@ dashboard_data = {
         'years_tracked': df['year'].nunique()
     },
     'executive_metrics': {
-        'total_observations': len(df),
-        'unique_events': df['id'].nunique(),
-        'category_counts': df['category_title'].value_counts().to_dict()
+        'total_observations': total_obs,
+        'unique_events': unique_events,
+        'category_counts': cat_counts.to_dict()
     },
     'hotspots': hotspots_df.to_dict('records'),
     'seasonal_patterns': seasonal_data,
@@ -195,10 +257,13 @@ dashboard_data = {
     'available_visualizations': available_visualizations
 }
 
-# Save
+# Save compact JSON (orjson handles the numpy scalars); EONET_DEBUG_JSON=1 pretty-prints
 output_file = 'vercel_app/public/analysis_data.json'
-with open(output_file, 'w') as f:
-    json.dump(dashboard_data, f, indent=2)
+options = orjson.OPT_SERIALIZE_NUMPY
+if os.environ.get('EONET_DEBUG_JSON'):
+    options |= orjson.OPT_INDENT_2
+with open(output_file, 'wb') as f:
+    f.write(orjson.dumps(dashboard_data, option=options))
 
 print(f"✅ Saved to: {output_file}")
 
@@ -209,10 +274,10 @@ print("\n" + "="*70)
 print("✨ COMPLETE DASHBOARD DATA GENERATED!")
 print("="*70)
 print(f"\n📊 Statistics:")
-print(f"  • Total observations: {len(df):,}")
+print(f"  • Total observations: {total_obs:,}")
 print(f"  • Hotspots detected: {len(hotspots_df)}")
-print(f"  • Images copied: {len([f for f in copied_files if f.endswith('.png')])}")
-print(f"  • HTML maps copied: {len([f for f in copied_files if f.endswith('.html')])}")
+print(f"  • Images copied: {len(pngs)}")
+print(f"  • HTML maps copied: {len(htmls)}")
 print(f"\n📁 Files:")
 print(f"  • {output_file}")
 print(f"  • vercel_app/public/analysis_images/ ({len(copied_files)} files)")